@@ -0,0 +1,182 @@
+"""Headless benchmarks for the tilemap, lighting, collision and message hot paths.
+
+Run from the repository root:
+
+    python benchmarks/bench_hotpaths.py
+    python benchmarks/bench_hotpaths.py --sizes 100,500 --out bench.json
+
+Results are printed (and optionally written) as JSON so runs can be compared
+across versions. Synthetic maps use the real tilesheets under assets/tiles.
+"""
+import os, sys, json, time, random, argparse, platform, statistics, tempfile
+from array import array
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout pure JSON
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from scripts.Tilemap import TileMap
+from scripts.lighting import Lighting
+from scripts.message_manager import MessageManager
+
+VIEW_SIZE = (800, 600)
+FLOOR_SHEET = "assets/tiles/Environment/TX Tileset Grass.png"
+WALL_SHEET = "assets/tiles/Environment/TX Tileset Wall.png"
+PROPS_SHEET = "assets/tiles/Props/TX Props with Shadow.png"
+
+
+def measure(fn, repeat=20, number=1):
+    """Time `fn` called `number` times per sample; returns stats in ms per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "ops_per_s": 1000 / statistics.median(samples) if statistics.median(samples) else None,
+    }
+
+
+def make_synthetic_map(size, seed=0, **kwargs):
+    """A size x size map: full floor, ~8% walls, ~3% props, a player spawn."""
+    rng = random.Random(seed)
+    tilemap = TileMap({"width": size, "height": size, "layers": {}}, **kwargs)
+    cells = size * size
+
+    floor = tilemap.add_layer("floor")
+    floor.data = array("H", [tilemap.pack_tile(FLOOR_SHEET, 0)]) * cells
+    for lname, sheet, density in (("wall", WALL_SHEET, 0.08), ("props", PROPS_SHEET, 0.03)):
+        layer = tilemap.add_layer(lname)
+        values = [tilemap.pack_tile(sheet, tid) for tid in range(8)]
+        for idx in rng.sample(range(cells), int(cells * density)):
+            layer.data[idx] = rng.choice(values)
+
+    tilemap.add_layer("spawnpoints").data[(size // 2) * size + size // 2] = tilemap.pack_marker("player")
+    tilemap.build_collision()
+    return tilemap
+
+
+def bench_load(tilemap, tmpdir, max_json_size):
+    size = tilemap.width
+    results = {}
+    bin_path = os.path.join(tmpdir, f"synthetic_{size}.llmap")
+    tilemap.save_binary(bin_path)
+    results["binary"] = measure(lambda: TileMap(bin_path), repeat=5)
+    if size <= max_json_size:
+        json_path = os.path.join(tmpdir, f"synthetic_{size}.json")
+        tilemap.save_json(json_path)
+        results["json"] = measure(lambda: TileMap(json_path), repeat=3)
+    return results
+
+
+def bench_draw(tilemap, screen):
+    world = tilemap.width * tilemap.tile_size
+    cameras = {
+        "origin": (0, 0),
+        "centre": (world // 2 - VIEW_SIZE[0] // 2, world // 2 - VIEW_SIZE[1] // 2),
+        "far_corner": (world - VIEW_SIZE[0], world - VIEW_SIZE[1]),
+    }
+    results = {}
+    for baked in (True, False):
+        tilemap.baked = baked
+        mode = "baked" if baked else "tiles"
+        for name, (cx, cy) in cameras.items():
+            tilemap.draw(screen, cx, cy)  # warm sheet and chunk caches
+            results[f"{mode}/{name}"] = measure(lambda: tilemap.draw(screen, cx, cy), repeat=10, number=5)
+    tilemap.baked = True
+    return results
+
+
+def bench_is_solid(tilemap, queries=20000):
+    rng = random.Random(1)
+    world = tilemap.width * tilemap.tile_size
+    rects = [pygame.Rect(rng.randrange(world), rng.randrange(world), 24, 16) for _ in range(queries)]
+    boxes = [tuple(rect) for rect in rects]
+    if np is not None:
+        boxes = np.array(boxes)  # batch callers keep their boxes in an (N, 4) array
+
+    def single():
+        for rect in rects:
+            tilemap.is_solid(rect)
+
+    stats = {"is_solid": measure(single, repeat=5), "rects_solid": measure(lambda: tilemap.rects_solid(boxes), repeat=5)}
+    for entry in stats.values():
+        entry["queries_per_s"] = queries * 1000 / entry["median_ms"]
+    return stats
+
+
+def bench_lights(screen, counts=(1, 10, 50, 200, 1000, 2000)):
+    rng = random.Random(2)
+    results = {}
+    lighting = Lighting(VIEW_SIZE)
+    for n in counts:
+        lights = [((rng.randrange(VIEW_SIZE[0]), rng.randrange(VIEW_SIZE[1])),
+                   rng.choice((15, 40, 80)), rng.choice((40, 64)), rng.choice((80, 120))) for _ in range(n)]
+
+        def frame():
+            lighting.clear(VIEW_SIZE)
+            for pos, rw, rh, intensity in lights:
+                lighting.add_light(pos, rw, rh, intensity)
+            lighting.draw(screen)
+
+        frame()  # warm the stamp cache
+        results[f"blit/{n}"] = measure(frame, repeat=10)
+    return results
+
+
+def bench_messages(screen):
+    font = pygame.font.SysFont(None, 24)
+    manager = MessageManager(font)
+    manager.add_message("The Fog cannot claim what is immune to doubt. Your path is lit from within.", duration_seconds=1000)
+    manager.add_message("The six Spheres are whole. The original light is reborn through your courage, Bringer of Dawn. Now, command the dawn!", duration_seconds=1000)
+    return {"draw_2_messages": measure(lambda: manager.draw(screen), repeat=10, number=20)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,500,2000", help="comma-separated synthetic map sizes")
+    parser.add_argument("--max-json-size", type=int, default=500, help="largest map size to benchmark JSON loading for")
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    pygame.init()
+    screen = pygame.display.set_mode(VIEW_SIZE)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            tilemap = make_synthetic_map(size)
+            report["results"][f"map_{size}"] = {
+                "load": bench_load(tilemap, tmpdir, args.max_json_size),
+                "draw": bench_draw(tilemap, screen),
+                "collision": bench_is_solid(tilemap),
+            }
+    report["results"]["lighting"] = bench_lights(screen)
+    report["results"]["messages"] = bench_messages(screen)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
-import pygame, json, os, sys
+import pygame, json, os, sys, math, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from scripts.text_cache import render_text
+from scripts.assets import asset_manager
+from scripts.tile_atlas import get_atlas
 
 TILE_SIZE = 32
 MAP_WIDTH, MAP_HEIGHT = 100, 100
+CHUNK_SIZE = 16    # tiles per side of a cached render chunk
+MAX_CHUNK_PIXELS = 16_000_000  # cached chunk area (~64 MB) kept before off-screen chunks are dropped
+MARKER_LAYERS = ("spawnpoints","orb_spawn","main_shrine_marker","shrine_logic")
+AUTOSAVE_INTERVAL = 60  # seconds between autosaves while there are unsaved edits
+AUTOSAVE_FILE = "map.autosave.json"
+UNDO_LIMIT = 200        # commands kept for undo
 
 pygame.init()
 screen = pygame.display.set_mode((800, 600), pygame.RESIZABLE)
@@ -82,23 +93,20 @@ def load_sheets(base_dir="assets/tiles"):
             if not fname.lower().endswith((".png", ".jpg", ".jpeg")):
                 continue
             full = os.path.join(root, fname)
+            tile_size = sheet_configs.get(fname, 32)
+            atlas = get_atlas(tile_size)
             try:
-                img = pygame.image.load(full).convert_alpha()
+                first, cols, rows = atlas.add_sheet(full)
             except Exception as e:
                 print("Failed to load", full, e)
                 continue
-            tile_size = sheet_configs.get(fname, 32)
-            tiles = []
-            cols = img.get_width() // tile_size
-            rows = img.get_height() // tile_size
-            for y in range(rows):
-                for x in range(cols):
-                    rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
-                    tiles.append(img.subsurface(rect).copy())
+            img = asset_manager.image(full)
+            tiles = range(first, first + cols * rows)  # global atlas indices
             if tiles:
                 sheets.append({
                     "path": full,
                     "basename": fname,
+                    "atlas": atlas,
                     "tiles": tiles,
                     "tile_size": tile_size,
                     "cols": cols,
@@ -113,37 +121,261 @@ if not sheets:
 current_sheet = 0
 tileset = sheets[current_sheet]["tiles"]
 selected_tile = 0
+sheet_index = {s["basename"]: s for s in sheets}  # tiles are matched to sheets by file name
+
+# Render caches, all valid for render_zoom only
+render_zoom = None
+scaled_tiles = {}     # (sheet basename, tile id) -> tile scaled to zoom
+marker_surfaces = {}  # spawn type -> marker square scaled to zoom
+chunk_surfaces = {}   # (cx, cy) -> all layers of that chunk, rendered
+preview_cache = {}    # sheet index -> sheet preview scaled to the viewer
+
+def set_render_zoom(z):
+    global render_zoom
+    if z != render_zoom:
+        render_zoom = z
+        scaled_tiles.clear()
+        marker_surfaces.clear()
+        chunk_surfaces.clear()
+
+def scaled_tile(sheet_path, tile_id):
+    key = (os.path.basename(sheet_path), tile_id)
+    img = scaled_tiles.get(key)
+    if img is None:
+        sheet_obj = sheet_index.get(key[0])
+        if not sheet_obj or not 0 <= tile_id < len(sheet_obj["tiles"]):
+            return None
+        size = int(TILE_SIZE*render_zoom)
+        tile = sheet_obj["atlas"].subsurface(sheet_obj["tiles"][tile_id])
+        img = scaled_tiles[key] = pygame.transform.scale(tile, (size, size))
+    return img
+
+def marker_surface(spawn_type):
+    img = marker_surfaces.get(spawn_type)
+    if img is None:
+        img = pygame.Surface((TILE_SIZE*render_zoom, TILE_SIZE*render_zoom), pygame.SRCALPHA)
+        img.fill(spawn_marker_colors.get(spawn_type, (255,255,255,150)))
+        marker_surfaces[spawn_type] = img
+    return img
+
+def render_chunk(cx, cy):
+    """Draw every layer of one chunk onto an opaque surface at render_zoom."""
+    tile_px = TILE_SIZE*render_zoom
+    size = math.ceil(CHUNK_SIZE*tile_px)
+    surf = pygame.Surface((size, size))
+    surf.fill((30,30,30))
+    x0, y0 = cx*CHUNK_SIZE, cy*CHUNK_SIZE
+    x1, y1 = min(x0+CHUNK_SIZE, MAP_WIDTH), min(y0+CHUNK_SIZE, MAP_HEIGHT)
+    for lname in layer_order:
+        layer = layers[lname]
+        markers = lname in MARKER_LAYERS
+        for y in range(y0, y1):
+            row = layer[y]
+            for x in range(x0, x1):
+                t = row[x]
+                if t is None: continue
+                img = marker_surface(t) if markers else scaled_tile(t["sheet"], t["id"])
+                if img:
+                    surf.blit(img, ((x-x0)*tile_px, (y-y0)*tile_px))
+    return surf
+
+def cell_changed(x, y):
+    """Call after editing a cell: drops its rendered chunk and marks it for saving."""
+    global unsaved_edits
+    key = (x//CHUNK_SIZE, y//CHUNK_SIZE)
+    chunk_surfaces.pop(key, None)
+    dirty_chunks.add(key)
+    unsaved_edits = True
+
+def sheet_preview(index, size):
+    img = preview_cache.get(index)
+    if img is None:
+        sheet = sheets[index]
+        area = (0, 0, sheet["cols"]*sheet["tile_size"], sheet["rows"]*sheet["tile_size"])
+        img = preview_cache[index] = pygame.transform.smoothscale(sheet["full_img"].subsurface(area), size)
+    return img
 
 # Load/Save map
 def load_map_sparse(filename="map.json"):
+    global MAP_WIDTH, MAP_HEIGHT
     if not os.path.exists(filename): return
     with open(filename, "r") as f: data = json.load(f)
+    MAP_WIDTH, MAP_HEIGHT = data.get("width", MAP_WIDTH), data.get("height", MAP_HEIGHT)
+    chunk_surfaces.clear()
     for lname in layers: layers[lname] = make_layer()
     for lname, tiles in data.get("layers", {}).items():
         if lname not in layers: continue
         for t in tiles:
             x, y = t["x"], t["y"]
-            if lname in ("spawnpoints","orb_spawn","main_shrine_marker","shrine_logic"):
+            if lname in MARKER_LAYERS:
                 layers[lname][y][x] = t["type"]
             else:
                 layers[lname][y][x] = {"sheet": t["sheet"], "id": t["id"]}
 
-def save_map_sparse(filename="map.json"):
-    map_data = {"width": MAP_WIDTH, "height": MAP_HEIGHT, "layers": {}}
+# Saving: each chunk's entries are serialized once and kept as JSON text, so a
+# save only re-serializes the chunks edited since the last one. The fragments
+# are joined and written on a background thread, to a temp file that is then
+# renamed into place.
+dirty_chunks = set()  # chunks edited since they were last serialized
+chunk_json = {}       # (cx, cy) -> {layer: JSON text of that chunk's entries}
+unsaved_edits = False
+last_save_time = time.time()
+save_executor = ThreadPoolExecutor(max_workers=1)  # one writer keeps saves in order
+
+def serialize_chunk(cx, cy):
+    fragments = {}
+    x0, y0 = cx*CHUNK_SIZE, cy*CHUNK_SIZE
     for lname, layer in layers.items():
-        map_data["layers"][lname] = []
-        for y, row in enumerate(layer):
-            for x, tile in enumerate(row):
+        entries = []
+        for y in range(y0, min(y0+CHUNK_SIZE, MAP_HEIGHT)):
+            row = layer[y]
+            for x in range(x0, min(x0+CHUNK_SIZE, MAP_WIDTH)):
+                tile = row[x]
                 if tile is None: continue
-                if lname in ("spawnpoints","orb_spawn","main_shrine_marker","shrine_logic"):
-                    map_data["layers"][lname].append({"x": x,"y": y,"type": tile})
+                if lname in MARKER_LAYERS:
+                    entries.append(json.dumps({"x": x,"y": y,"type": tile}))
                 else:
-                    map_data["layers"][lname].append({"x": x,"y": y,"sheet": tile["sheet"],"id": tile["id"]})
-
-    with open(filename, "w") as f: json.dump(map_data, f, indent=4)
+                    entries.append(json.dumps({"x": x,"y": y,"sheet": tile["sheet"],"id": tile["id"]}))
+        if entries:
+            fragments[lname] = ",\n".join(entries)
+    return fragments
+
+def serialize_dirty_chunks():
+    """Re-serialize the chunks edited since the last save (main thread)."""
+    for key in dirty_chunks:
+        chunk_json[key] = serialize_chunk(*key)
+    dirty_chunks.clear()
+
+def map_json_text(chunks, layer_names, width, height):
+    """The whole map as JSON, joined from per-chunk fragments (writer thread)."""
+    order = sorted(chunks, key=lambda key: (key[1], key[0]))
+    parts = []
+    for lname in layer_names:
+        fragments = [chunks[key][lname] for key in order if lname in chunks[key]]
+        parts.append(f"{json.dumps(lname)}: [\n" + ",\n".join(fragments) + "\n]")
+    return f'{{"width": {width}, "height": {height}, "layers": {{\n' + ",\n".join(parts) + "\n}}\n"
+
+def write_map(filename, chunks, layer_names, width, height):
+    write_atomic(filename, map_json_text(chunks, layer_names, width, height))
+
+def write_atomic(filename, text):
+    tmp = filename + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, filename)
     print(f"Map saved as {filename}!")
 
+def save_map_sparse(filename="map.json"):
+    """Queue a save; the file is written in the background."""
+    global unsaved_edits, last_save_time
+    serialize_dirty_chunks()
+    # A shallow snapshot will do: the fragments are immutable strings, and the
+    # join into one file happens on the writer thread
+    future = save_executor.submit(write_map, filename, dict(chunk_json), list(layers), MAP_WIDTH, MAP_HEIGHT)
+    future.add_done_callback(lambda future: save_finished(future, filename))
+    unsaved_edits = False
+    last_save_time = time.time()
+
+def save_finished(future, filename):
+    """Runs on the writer thread: report a failed save and keep the edits unsaved."""
+    global unsaved_edits
+    error = future.exception()
+    if error is not None:
+        print(f"Could not save {filename}: {error}", file=sys.stderr)
+        unsaved_edits = True  # so the next autosave tries again
+
 load_map_sparse()
+dirty_chunks.update((cx, cy) for cy in range((MAP_HEIGHT+CHUNK_SIZE-1)//CHUNK_SIZE) for cx in range((MAP_WIDTH+CHUNK_SIZE-1)//CHUNK_SIZE))
+serialize_dirty_chunks()  # serialize everything once up front, so saves only redo edited chunks
+
+# Editing: every change goes through set_cell, which records it in the
+# command being built, so a stroke or fill undoes as one step. Commands hold
+# only the cells they changed, as (layer, x, y, old, new).
+undo_stack = []
+redo_stack = []
+current_command = None
+
+def begin_command():
+    global current_command
+    current_command = []
+
+def end_command():
+    global current_command
+    if current_command:
+        undo_stack.append(current_command)
+        del undo_stack[:-UNDO_LIMIT]
+        redo_stack.clear()
+    current_command = None
+
+def set_cell(lname, x, y, value):
+    old = layers[lname][y][x]
+    if old == value: return
+    layers[lname][y][x] = value
+    cell_changed(x, y)
+    if current_command is not None:
+        current_command.append((lname, x, y, old, value))
+
+def apply_command(command, undo):
+    for lname, x, y, old, new in (reversed(command) if undo else command):
+        layers[lname][y][x] = old if undo else new
+        cell_changed(x, y)
+
+def undo():
+    if undo_stack:
+        command = undo_stack.pop()
+        apply_command(command, True)
+        redo_stack.append(command)
+
+def redo():
+    if redo_stack:
+        command = redo_stack.pop()
+        apply_command(command, False)
+        undo_stack.append(command)
+
+def brush_value():
+    if current_layer in MARKER_LAYERS:
+        return selected_spawn_type
+    return {"sheet": sheets[current_sheet]["path"], "id": selected_tile}
+
+def screen_to_cell(pos):
+    return int((pos[0]+camera_x)/(TILE_SIZE*zoom)), int((pos[1]+camera_y)/(TILE_SIZE*zoom))
+
+def in_map(x, y):
+    return 0 <= x < MAP_WIDTH and 0 <= y < MAP_HEIGHT
+
+def paint_line(start, end, value):
+    """Set every cell on the line between two cells, so fast drags leave no gaps."""
+    (x0, y0), (x1, y1) = start, end
+    steps = max(abs(x1-x0), abs(y1-y0), 1)
+    for i in range(steps+1):
+        x, y = x0 + round((x1-x0)*i/steps), y0 + round((y1-y0)*i/steps)
+        if in_map(x, y):
+            set_cell(current_layer, x, y, value)
+
+def fill_rect(start, end, value):
+    x0, x1 = sorted((start[0], end[0]))
+    y0, y1 = sorted((start[1], end[1]))
+    for y in range(max(0, y0), min(MAP_HEIGHT-1, y1)+1):
+        for x in range(max(0, x0), min(MAP_WIDTH-1, x1)+1):
+            set_cell(current_layer, x, y, value)
+
+def flood_fill(x, y, value):
+    """Fill the 4-connected region of cells equal to (x, y) on the current layer."""
+    layer = layers[current_layer]
+    target = layer[y][x]
+    if target == value: return
+    seen = bytearray(MAP_WIDTH*MAP_HEIGHT)
+    seen[y*MAP_WIDTH + x] = 1
+    queue = deque([(x, y)])
+    while queue:
+        x, y = queue.popleft()
+        set_cell(current_layer, x, y, value)
+        for nx, ny in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+            if in_map(nx, ny) and not seen[ny*MAP_WIDTH + nx] and layer[ny][nx] == target:
+                seen[ny*MAP_WIDTH + nx] = 1
+                queue.append((nx, ny))
+
+last_paint_cell = None  # cell painted by the previous drag step
 
 # Help
 help_lines = [
@@ -151,12 +383,16 @@ help_lines = [
     "[Mouse wheel] Zoom in/out",
     "[T] Toggle spawn placement | [Y] Cycle spawn type",
     "[L] Switch layer | [C] Next sheet",
-    "Left Click: Place tile/spawn",
-    "Right Click: Erase",
-    "[P] Save map",
+    "Left Click/Drag: Place tile/spawn | Right Click/Drag: Erase",
+    "Shift+Drag: Fill/erase rectangle | [G] Flood fill at cursor",
+    "[Ctrl+Z] Undo | [Ctrl+Y] Redo",
+    f"[P] Save map (autosaves to {AUTOSAVE_FILE})",
     "Click tilesheet preview to select tile"
 ]
 
+viewer_bg = pygame.Surface((320+4, 320+4),pygame.SRCALPHA)
+viewer_bg.fill((50,50,50,160))
+
 # Main loop
 running = True
 clock = pygame.time.Clock()
@@ -170,7 +406,11 @@ while running:
 
         # Keypresses
         elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_p: save_map_sparse()
+            ctrl = event.mod & pygame.KMOD_CTRL
+            if event.key == pygame.K_z and ctrl:
+                redo() if event.mod & pygame.KMOD_SHIFT else undo()
+            elif event.key == pygame.K_y and ctrl: redo()
+            elif event.key == pygame.K_p: save_map_sparse()
             elif event.key == pygame.K_t:
                 placing_spawn = not placing_spawn
                 current_layer = spawn_layer_map[selected_spawn_type] if placing_spawn else "floor"
@@ -187,6 +427,12 @@ while running:
                 tileset = sheets[current_sheet]["tiles"]
                 selected_tile = 0
                 print("Switched sheet:", sheets[current_sheet]["basename"])
+            elif event.key == pygame.K_g:
+                tx_map, ty_map = screen_to_cell(pygame.mouse.get_pos())
+                if in_map(tx_map, ty_map):
+                    begin_command()
+                    flood_fill(tx_map, ty_map, brush_value())
+                    end_command()
             elif event.key == pygame.K_F11:
                 is_fullscreen = not is_fullscreen
                 screen = pygame.display.set_mode((0,0),pygame.FULLSCREEN) if is_fullscreen else pygame.display.set_mode((800,600),pygame.RESIZABLE)
@@ -210,18 +456,48 @@ while running:
                 print(f"Selected tile {selected_tile} from sheet preview")
                 continue
 
-            # Map painting
-            tx_map, ty_map = int((mx+camera_x)/(TILE_SIZE*zoom)), int((my+camera_y)/(TILE_SIZE*zoom))
-            if 0 <= tx_map < MAP_WIDTH and 0 <= ty_map < MAP_HEIGHT:
-                if event.button == 1:
-                    if current_layer in ("spawnpoints","orb_spawn","main_shrine_marker","shrine_logic"):
-                        layers[current_layer][ty_map][tx_map] = selected_spawn_type
-                    else:
-                        layers[current_layer][ty_map][tx_map] = {"sheet": sheets[current_sheet]["path"], "id": selected_tile}
-                elif event.button == 3:
-                    layers[current_layer][ty_map][tx_map] = None
+            # Map painting: click/drag paints, shift+drag spans a rectangle.
+            # The other button is ignored until the current stroke ends
+            tx_map, ty_map = screen_to_cell(event.pos)
+            busy = dragging or erasing or drag_start or erase_start
+            if in_map(tx_map, ty_map) and event.button in (1, 3) and not busy:
+                shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+                if event.button == 1 and shift:
+                    drag_start = (tx_map, ty_map)
+                elif event.button == 3 and shift:
+                    erase_start = (tx_map, ty_map)
+                else:
+                    dragging, erasing = event.button == 1, event.button == 3
+                    brush = brush_value() if dragging else None
+                    begin_command()
+                    last_paint_cell = (tx_map, ty_map)
+                    set_cell(current_layer, tx_map, ty_map, brush)
+        elif event.type == pygame.MOUSEMOTION and (dragging or erasing):
+            cell = screen_to_cell(event.pos)
+            if cell != last_paint_cell:
+                paint_line(last_paint_cell, cell, brush)
+                last_paint_cell = cell
+        elif event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3):
+            cell = screen_to_cell(event.pos)
+            if event.button == 1 and drag_start:
+                begin_command()
+                fill_rect(drag_start, cell, brush_value())
+                end_command()
+                drag_start = None
+            elif event.button == 3 and erase_start:
+                begin_command()
+                fill_rect(erase_start, cell, None)
+                end_command()
+                erase_start = None
+            if (event.button == 1 and dragging) or (event.button == 3 and erasing):
+                end_command()
+                dragging = erasing = False
         elif event.type == pygame.MOUSEWHEEL:
-            zoom = max(0.25,min(2.0, zoom + event.y*0.1))
+            # Rounded so repeated steps land on the same zoom levels (and caches)
+            zoom = round(max(0.25,min(2.0, zoom + event.y*0.1)), 2)
+
+    if unsaved_edits and time.time() - last_save_time >= AUTOSAVE_INTERVAL:
+        save_map_sparse(AUTOSAVE_FILE)
 
     # Movement
     keys = pygame.key.get_pressed()
@@ -230,50 +506,56 @@ while running:
     if keys[pygame.K_w]: camera_y -= CAMERA_SPEED
     if keys[pygame.K_s]: camera_y += CAMERA_SPEED
 
-    # Draw map
+    # Draw map: only the chunks in view, each rendered once per zoom level
     screen.fill((30,30,30))
-    for lname in layer_order:
-        for y,row in enumerate(layers[lname]):
-            for x,t in enumerate(row):
-                if t is None: continue
-                if lname in ("spawnpoints","orb_spawn","main_shrine_marker","shrine_logic"):
-                    color = spawn_marker_colors.get(t,(255,255,255,150))
-                    rect = pygame.Surface((TILE_SIZE*zoom,TILE_SIZE*zoom),pygame.SRCALPHA)
-                    rect.fill(color)
-                    screen.blit(rect,(x*TILE_SIZE*zoom - camera_x, y*TILE_SIZE*zoom - camera_y))
-                else:
-                    sheet_path, tile_id = t["sheet"], t["id"]
-                    sheet_obj = next((s for s in sheets if os.path.basename(s["path"])==os.path.basename(sheet_path)), None)
-                    if sheet_obj and 0<=tile_id<len(sheet_obj["tiles"]):
-                        img = pygame.transform.scale(sheet_obj["tiles"][tile_id],(int(TILE_SIZE*zoom),int(TILE_SIZE*zoom)))
-                        screen.blit(img,(x*TILE_SIZE*zoom - camera_x, y*TILE_SIZE*zoom - camera_y))
-
-    # Grid
-    for gx in range(MAP_WIDTH+1):
-        pygame.draw.line(screen,(60,60,60),(gx*TILE_SIZE*zoom - camera_x,0),(gx*TILE_SIZE*zoom - camera_x,view_h))
-    for gy in range(MAP_HEIGHT+1):
-        pygame.draw.line(screen,(60,60,60),(0, gy*TILE_SIZE*zoom - camera_y),(view_w, gy*TILE_SIZE*zoom - camera_y))
+    set_render_zoom(zoom)
+    tile_px = TILE_SIZE*zoom
+    chunk_px = CHUNK_SIZE*tile_px
+    cx0, cy0 = max(0, int(camera_x//chunk_px)), max(0, int(camera_y//chunk_px))
+    cx1 = min((MAP_WIDTH-1)//CHUNK_SIZE, int((camera_x+view_w)//chunk_px))
+    cy1 = min((MAP_HEIGHT-1)//CHUNK_SIZE, int((camera_y+view_h)//chunk_px))
+    visible = [(cx, cy) for cy in range(cy0, cy1+1) for cx in range(cx0, cx1+1)]
+    for key in visible:
+        surf = chunk_surfaces.get(key)
+        if surf is None:
+            surf = chunk_surfaces[key] = render_chunk(*key)
+        screen.blit(surf, (key[0]*chunk_px - camera_x, key[1]*chunk_px - camera_y))
+    # Chunks grow with the zoom (4 MB each at 2.0), so the cap is on their area
+    if len(chunk_surfaces) * int(chunk_px)**2 > MAX_CHUNK_PIXELS:
+        for key in set(chunk_surfaces) - set(visible):
+            del chunk_surfaces[key]
+
+    # Grid (visible lines only)
+    gx0, gy0 = max(0, int(camera_x//tile_px)), max(0, int(camera_y//tile_px))
+    gx1, gy1 = min(MAP_WIDTH, int((camera_x+view_w)//tile_px)+1), min(MAP_HEIGHT, int((camera_y+view_h)//tile_px)+1)
+    for gx in range(gx0, gx1+1):
+        pygame.draw.line(screen,(60,60,60),(gx*tile_px - camera_x,0),(gx*tile_px - camera_x,view_h))
+    for gy in range(gy0, gy1+1):
+        pygame.draw.line(screen,(60,60,60),(0, gy*tile_px - camera_y),(view_w, gy*tile_px - camera_y))
+
+    # Rectangle being dragged out
+    rect_start = drag_start or erase_start
+    if rect_start:
+        (x0, x1), (y0, y1) = [sorted(pair) for pair in zip(rect_start, screen_to_cell(pygame.mouse.get_pos()))]
+        outline = pygame.Rect(x0*tile_px - camera_x, y0*tile_px - camera_y, (x1-x0+1)*tile_px, (y1-y0+1)*tile_px)
+        pygame.draw.rect(screen, (255,235,59) if drag_start else (255,80,80), outline, 2)
 
     # HUD
     ui_text = f"[Spawn Mode] {selected_spawn_type}" if placing_spawn else f"[Tile Mode] Layer: {current_layer}"
-    screen.blit(font.render(ui_text,True,(255,255,255)),(10,8))
+    screen.blit(render_text(font,ui_text,(255,255,255)),(10,8))
 
     # Help
     for i,line in enumerate(help_lines):
-        screen.blit(font.render(line,True,(200,200,200)),(10,30+i*18))
+        screen.blit(render_text(font,line,(200,200,200)),(10,30+i*18))
 
     # Tilesheet viewer (bottom-left)
     sheet = sheets[current_sheet]
     viewer_w, viewer_h = 320, 320
     viewer_x, viewer_y = 10, view_h - viewer_h - 10
-    viewer_bg = pygame.Surface((viewer_w+4, viewer_h+4),pygame.SRCALPHA)
-    viewer_bg.fill((50,50,50,160))
     screen.blit(viewer_bg,(viewer_x-2, viewer_y-2))
-    full_img = sheet["full_img"]
     cols, rows = sheet["cols"], sheet["rows"]
     if cols>0 and rows>0:
-        scaled_sheet = pygame.transform.smoothscale(full_img.subsurface((0,0,cols*sheet["tile_size"], rows*sheet["tile_size"])), (viewer_w, viewer_h))
-        screen.blit(scaled_sheet,(viewer_x, viewer_y))
+        screen.blit(sheet_preview(current_sheet, (viewer_w, viewer_h)),(viewer_x, viewer_y))
         cell_w, cell_h = viewer_w/cols, viewer_h/rows
         for c in range(cols+1):
             x = viewer_x + int(c*cell_w)
@@ -286,9 +568,10 @@ while running:
         if sel_row < rows:
             hl_rect = pygame.Rect(viewer_x + sel_col*cell_w, viewer_y + sel_row*cell_h, cell_w, cell_h)
             pygame.draw.rect(screen,(255,235,59),hl_rect,3)
-    screen.blit(font.render("Sheet Preview (click to select)", True, (255,255,255)),(viewer_x,viewer_y-18))
+    screen.blit(render_text(font,"Sheet Preview (click to select)",(255,255,255)),(viewer_x,viewer_y-18))
 
     pygame.display.flip()
 
+save_executor.shutdown(wait=True)  # let a pending save finish
 pygame.quit()
 sys.exit()
@@ -1,181 +1,242 @@
-import pygame, sys, math, time
+import time
+STARTED = time.perf_counter()  # for --startup-timing
+import pygame, sys, math, argparse, atexit
 from scripts.Tilemap import TileMap
-from scripts.player import Player
-from scripts.orb import Orb
-from scripts.shrine import ShrineManager
-from scripts.message_manager import MessageManager
+from scripts.game import Simulation, SIM_DT
 from scripts.sounds import *
-from scripts.lighting import draw_light
+from scripts.lighting import Lighting
+from scripts.profiler import Profiler
+from scripts.text_cache import render_text
+from scripts.assets import asset_manager
+from scripts.render_queue import RenderQueue
 from scripts.ui.menu import main_menu
 from scripts.ui.scenes import show_opening_scene, show_thank_you_screen, show_how_to_play
 
-pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 24)
+LIGHT_SHADOWS = True       # cast shadows from walls
+
+# Simulation runs at a fixed rate; rendering runs as fast as RENDER_FPS allows
+# and interpolates between the last two simulation states.
+SIM_HZ = round(1 / SIM_DT)
+RENDER_FPS = 60
+MAX_FRAME_TIME = 0.25  # clamp long stalls so the simulation can catch up
+
+# Created in main() so importing this module has no side effects
+screen = None
+clock = None
+font = None
+debug_font = None
+tilemap = None
+map_loader = None  # Future for the map, parsed in the background at startup
+profiler = Profiler()
+startup_timing = False
+startup_done = False
+
+
+def poll_events():
+    """Handle window/system keys; returns the movement input for this frame."""
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                pygame.quit()
+                sys.exit()
+            elif event.key == pygame.K_m:
+                toggle_mute()
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):
+                change_ambient_volume(0.1)
+            elif event.key == pygame.K_MINUS:
+                change_ambient_volume(-0.1)
+            elif event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+
+    keys = pygame.key.get_pressed()
+    return keys[pygame.K_d] - keys[pygame.K_a], keys[pygame.K_s] - keys[pygame.K_w]
+
+
+def report_startup(what):
+    if startup_timing:
+        print(f"[startup] {what} after {(time.perf_counter() - STARTED) * 1000:.0f} ms")
 
-tilemap = TileMap("map.json", 32)
-play_ambient()
+
+def finish_startup():
+    """Called after every menu frame; once the first one is on screen, start
+    the slower subsystems so they load while the player reads the menu."""
+    global startup_done, map_loader, debug_font
+    if startup_done:
+        return
+    startup_done = True
+    report_startup("first menu frame")
+
+    map_loader = asset_manager.submit(TileMap, "map.json", 32)
+    map_loader.add_done_callback(lambda _: report_startup("map loaded"))
+    asset_manager.preload()
+    init_audio()
+    play_ambient()
+    debug_font = pygame.font.SysFont("monospace", 14)  # looking up a system font can be slow
 
 
 def start_game():
-    player = None
-    orbs = []
-
-    # Spawn player
-    spawn_layer = tilemap.layers.get("spawnpoints", [])
-    for y, row in enumerate(spawn_layer):
-        for x, tile_type in enumerate(row):
-            if tile_type and tile_type.lower() == "player":
-                world_x = x * tilemap.tile_size
-                world_y = y * tilemap.tile_size
-                player = Player(world_x, world_y, tilemap)
-    if player is None:
-        raise RuntimeError("No player spawn found!")
-
-    # Spawn orbs
-    orb_layer = tilemap.layers.get("orb_spawn", [])
-    for y, row in enumerate(orb_layer):
-        for x, marker in enumerate(row):
-            if marker and marker.lower() == "orb":
-                orb_size = 24
-                orbs.append(Orb(x, y, width=orb_size, height=orb_size))
-    total_orbs = len(orbs)
-
-    message_manager = MessageManager(font)
-    shrine_manager = ShrineManager(tilemap, total_orbs)
+    sim = Simulation(tilemap, (SCREEN_WIDTH, SCREEN_HEIGHT), font, profiler=profiler)
+    player = sim.player
+    shrine_manager = sim.shrine_manager
+    message_manager = sim.message_manager
+    lighting = Lighting((SCREEN_WIDTH, SCREEN_HEIGHT), occluder=tilemap)
+    light_margin = 80  # widest light radius, so lights just off-screen still reach in
+    queue = RenderQueue()  # world, entities, fog and player are submitted in batches
 
     main_shrine_light_radius = 50
     main_shrine_max_radius = max(SCREEN_WIDTH, SCREEN_HEIGHT)
     main_shrine_expand_speed = 200
-    player_at_main_shrine = False
     player_light_radius = 80
-    time_accumulator = 0
-    running = True
-    game_completed = False
 
-    while running:
-        dt = clock.tick(60) / 1000
-        time_accumulator += dt
+    sim_dt = 1 / SIM_HZ
+    accumulator = 0.0
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                elif event.key == pygame.K_m:
-                    toggle_mute()
-                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):
-                    change_ambient_volume(0.1)
-                elif event.key == pygame.K_MINUS:
-                    change_ambient_volume(-0.1)
-
-        # Player update
-        if not getattr(player, "disable_input", False):
-            player.handle_input()
-        player.update(dt)
-
-        # Orbs update
-        for orb in orbs:
-            orb.update(dt)
-            orb.offset_y = math.sin(time_accumulator * 2 + orb.tile_x + orb.tile_y) * 5
-            if not orb.collected and orb.check_collision(player.hitbox):
-                orb.collected = True
-                play_orb_sound()
-        orbs_collected = sum(1 for orb in orbs if orb.collected)
-
-        # Shrine update
-        shrine_manager.update(player, message_manager, orbs_collected, dt)
+    while not sim.completed:
+        dt = min(clock.tick(RENDER_FPS) / 1000, MAX_FRAME_TIME)
+        accumulator += dt
+
+        with profiler.scope("input"):
+            move = poll_events()
+        while accumulator >= sim_dt and not sim.completed:
+            for event, _ in sim.step(sim_dt, move):
+                if event == "orb_collected":
+                    play_orb_sound()
+            accumulator -= sim_dt
+        alpha = min(1.0, accumulator / sim_dt)
 
         # Camera
-        camera_x = max(0, min(player.rect.centerx - SCREEN_WIDTH // 2,
-                              tilemap.width * tilemap.tile_size - SCREEN_WIDTH))
-        camera_y = max(0, min(player.rect.centery - SCREEN_HEIGHT // 2,
-                              tilemap.height * tilemap.tile_size - SCREEN_HEIGHT))
+        camera_x, camera_y = sim.camera(alpha)
+        view_rect = pygame.Rect(camera_x, camera_y, SCREEN_WIDTH, SCREEN_HEIGHT).inflate(light_margin * 2, light_margin * 2)
+
+        # Orb animation (only orbs near the view animate)
+        with profiler.scope("orbs.animate"):
+            visible_orbs = sim.orb_index.query_rect(view_rect)
+            for orb in visible_orbs:
+                orb.update(dt)
+                orb.offset_y = math.sin(sim.time * 2 + orb.tile_x + orb.tile_y) * 5
+        profiler.count("orbs", len(visible_orbs))
 
         # Draw world
+        with profiler.scope("tilemap.draw"):
+            screen.fill((10, 10, 10))
+            tilemap.draw(screen, camera_x, camera_y, queue)
+        profiler.count("chunks", tilemap.chunks_drawn)
+        profiler.count("tiles", tilemap.tiles_drawn)
+        with profiler.scope("entities.draw"):
+            for orb in visible_orbs:
+                orb.draw(screen, camera_x, camera_y, tile_size=tilemap.tile_size, queue=queue)
+            shrine_manager.draw(screen, queue)
+
+        with profiler.scope("lighting"):
+            lighting.clear(screen.get_size(), camera=(camera_x, camera_y))
+
+            ox, oy = player.render_offset(alpha)
+            player_pos = (int(player.rect.centerx + ox - camera_x), int(player.rect.centery + oy - camera_y))
+            lighting.add_light(player_pos, int(player_light_radius), int(player_light_radius * 0.8), intensity=80, shadows=LIGHT_SHADOWS)
+
+            # Shrine lights
+            for shrine in shrine_manager.shrines_near(view_rect):
+                shrine_pos_screen = (
+                    int(shrine.rect.centerx - camera_x),
+                    int(shrine.rect.centery - camera_y - 35)
+                )
+                if shrine == shrine_manager.main_shrine and sim.orbs_collected == sim.total_orbs:
+                    radius = main_shrine_light_radius if sim.player_at_main_shrine else 15
+                    lighting.add_light(shrine_pos_screen, radius, radius, intensity=150 if sim.player_at_main_shrine else 120, shadows=LIGHT_SHADOWS)
+                else:
+                    lighting.add_light(shrine_pos_screen, 15, 40, intensity=120, shadows=LIGHT_SHADOWS)
+
+            # Orbs light
+            for orb in visible_orbs:
+                if orb.collected: continue
+                orb_pos = (
+                    int(orb.tile_x * tilemap.tile_size - camera_x + tilemap.tile_size//2),
+                    int(orb.tile_y * tilemap.tile_size - camera_y + tilemap.tile_size//2 + getattr(orb, 'offset_y', 0))
+                )
+                inner_radius = 8 + 4 * math.sin(sim.time * 4 + orb.tile_x + orb.tile_y)
+                lighting.add_light(orb_pos, 40, 40, intensity=120, shadows=LIGHT_SHADOWS)
+                lighting.add_glow(orb_pos, int(inner_radius), (255, 200, 50, 180))
+
+            lighting.draw(screen, queue)
+        profiler.count("lights", lighting.lights_drawn)
+        profiler.count("lights_culled", lighting.lights_culled)
+
+        player.draw(screen, camera_x, camera_y, alpha, queue=queue)
+        profiler.count("blits", len(queue))
+        with profiler.scope("render.flush"):
+            queue.flush(screen)
+        with profiler.scope("messages"):
+            message_manager.draw(screen)
+
+            orb_text = render_text(font, f"Orbs: {sim.orbs_collected}/{sim.total_orbs}", (255, 255, 255))
+            screen.blit(orb_text, (SCREEN_WIDTH - orb_text.get_width() - 10, 10))
+        profiler.draw(screen, debug_font)
+
+        with profiler.scope("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+
+    # Ending: the main shrine's light swells to fill the screen
+    camera_x, camera_y = sim.camera()
+    while main_shrine_light_radius < main_shrine_max_radius:
+        dt = clock.tick(RENDER_FPS) / 1000
+        main_shrine_light_radius += main_shrine_expand_speed * dt
+        radius = min(main_shrine_light_radius, main_shrine_max_radius)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                sys.exit()
         screen.fill((10, 10, 10))
         tilemap.draw(screen, camera_x, camera_y)
-        for orb in orbs:
-            orb.draw(screen, camera_x, camera_y, tile_size=tilemap.tile_size)
-        shrine_manager.draw(screen)
-
-        fog = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        fog.fill((0, 0, 0, 220))
-
-        player_pos = (int(player.rect.centerx - camera_x), int(player.rect.centery - camera_y))
-        draw_light(fog, player_pos, int(player_light_radius), int(player_light_radius * 0.8), intensity=80)
-
-        # Shrine lights
-        for shrine in shrine_manager.shrines + ([shrine_manager.main_shrine] if shrine_manager.main_shrine else []):
-            if shrine is None: continue
-            shrine_pos_screen = (
-                int(shrine.rect.centerx - camera_x),
-                int(shrine.rect.centery - camera_y - 35)
-            )
-            if shrine == shrine_manager.main_shrine and orbs_collected == total_orbs:
-                if player.rect.colliderect(shrine.rect):
-                    player_at_main_shrine = True
-                radius = main_shrine_light_radius if player_at_main_shrine else 15
-                draw_light(fog, shrine_pos_screen, radius, radius, intensity=150 if player_at_main_shrine else 120)
-            else:
-                draw_light(fog, shrine_pos_screen, 15, 40, intensity=120)
-
-        # Orbs light
-        for orb in orbs:
-            if orb.collected: continue
-            orb_pos = (
-                int(orb.tile_x * tilemap.tile_size - camera_x + tilemap.tile_size//2),
-                int(orb.tile_y * tilemap.tile_size - camera_y + tilemap.tile_size//2 + getattr(orb, 'offset_y', 0))
-            )
-            inner_radius = 8 + 4 * math.sin(time_accumulator * 4 + orb.tile_x + orb.tile_y)
-            draw_light(fog, orb_pos, 40, 40, intensity=120)
-            pygame.draw.circle(fog, (255, 200, 50, 180), orb_pos, int(inner_radius))
-
-        screen.blit(fog, (0, 0))
         player.draw(screen, camera_x, camera_y)
-        message_manager.update()
+        lighting.clear(screen.get_size(), camera=(camera_x, camera_y))
+        lighting.add_light((shrine_manager.main_shrine.rect.centerx - camera_x, shrine_manager.main_shrine.rect.centery - camera_y - 35), int(radius), int(radius), intensity=150)
+        lighting.draw(screen)
+        message_manager.update(dt)
         message_manager.draw(screen)
-
-        orb_text = font.render(f"Orbs: {orbs_collected}/{len(orbs)}", True, (255, 255, 255))
-        screen.blit(orb_text, (SCREEN_WIDTH - orb_text.get_width() - 10, 10))
-
         pygame.display.flip()
-
-        # Check completion
-        if player_at_main_shrine and orbs_collected == total_orbs and not game_completed:
-            game_completed = True
-            message_manager.add_message(
-                "The six Spheres are whole. The original light is reborn through your courage, Bringer of Dawn. Now, command the dawn!",
-                duration_seconds=4
-            )
-            while main_shrine_light_radius < main_shrine_max_radius:
-                dt = clock.tick(60) / 1000
-                main_shrine_light_radius += 200 * dt
-                radius = min(main_shrine_light_radius, main_shrine_max_radius)
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                        pygame.quit()
-                        sys.exit()
-                screen.fill((10, 10, 10))
-                tilemap.draw(screen, camera_x, camera_y)
-                player.draw(screen, camera_x, camera_y)
-                fog.fill((0, 0, 0, 220))
-                draw_light(fog, (shrine_manager.main_shrine.rect.centerx - camera_x, shrine_manager.main_shrine.rect.centery - camera_y - 35), int(radius), int(radius), intensity=150)
-                screen.blit(fog, (0, 0))
-                message_manager.update()
-                message_manager.draw(screen)
-                pygame.display.flip()
-            show_thank_you_screen(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT)
-            running = False
-
-
-# Outer loop
-while True:
-    main_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT, start_game, show_opening_scene, show_how_to_play)
-    show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT)
-    start_game()
+    show_thank_you_screen(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def main():
+    global screen, clock, font, tilemap, profiler, startup_timing, SIM_HZ, RENDER_FPS
+    parser = argparse.ArgumentParser(description="The Last Light")
+    parser.add_argument("--sim-hz", type=int, default=SIM_HZ, help="simulation ticks per second")
+    parser.add_argument("--fps", type=int, default=RENDER_FPS, help="render frame cap (0 = uncapped)")
+    parser.add_argument("--profile", action="store_true", help="show the frame-time overlay (toggle with F3)")
+    parser.add_argument("--profile-dump", metavar="FILE", help="write per-frame timings to a .csv or .json file")
+    parser.add_argument("--startup-timing", action="store_true", help="print the time taken to reach the menu and load the map")
+    args = parser.parse_args()
+    SIM_HZ, RENDER_FPS = args.sim_hz, args.fps
+    startup_timing = args.startup_timing
+    profiler = Profiler(enabled=args.profile, dump_path=args.profile_dump)
+    atexit.register(profiler.dump)
+
+    # Only what the menu needs; the mixer is opened after the first menu frame
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 24)
+    report_startup("window open")
+
+    # Outer loop
+    while True:
+        main_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT, start_game, show_opening_scene, show_how_to_play, on_frame=finish_startup)
+        show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT)
+        tilemap = map_loader.result()
+        spawn = next(((x, y) for x, y, marker in tilemap.cells("spawnpoints") if marker.lower() == "player"), None)
+        tilemap.bake_all(around=spawn)  # needs the display, so not on the loader thread
+        asset_manager.wait()  # gameplay never waits on disk
+        start_game()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        asset_manager.shutdown()  # quitting from the menu should not wait for the preload
@@ -1,4 +1,78 @@
-import pygame, os, json
+import pygame, os, sys, json, mmap, struct
+from array import array
+from scripts.tile_atlas import get_atlas
+from scripts.render_queue import LAYER_WORLD
+
+try:
+    import numpy as np
+except ImportError:  # batch collision queries fall back to plain Python
+    np = None
+
+# Packed tile value layout: high bits hold sheet index + 1, low bits the tile id.
+# A value of 0 means an empty cell.
+TILE_ID_BITS = 10
+TILE_ID_MASK = (1 << TILE_ID_BITS) - 1
+
+# Binary map format (.llmap), all little-endian:
+#   header       MAP_MAGIC, tile id bits, pad, width, height, #sheets, #markers, #layers
+#   strings      sheet paths then marker types, each as uint16 length + utf-8 bytes
+#   per layer    name string, kind byte (0 = tiles, 1 = logic), padding to an even
+#                offset, then width * height uint16 cells
+# The cell grids are read straight out of a copy-on-write mmap, so loading does
+# not depend on map size.
+MAP_MAGIC = b"LLMAP1"
+MAP_HEADER = struct.Struct("<6sBxIIHHH")
+
+
+def is_binary_map(path):
+    """True if `path` starts with the binary map magic."""
+    with open(path, "rb") as f:
+        return f.read(len(MAP_MAGIC)) == MAP_MAGIC
+
+
+class TileLayer:
+    """One map layer stored as a flat array('H') of packed values (0 = empty).
+
+    `names` is the interned table the values index into: sheet paths for
+    tile layers, marker type strings for logic layers.
+    """
+
+    def __init__(self, width, height, names, logic=False, data=None):
+        self.width = width
+        self.height = height
+        self.names = names
+        self.logic = logic
+        self.data = data if data is not None else array("H", bytes(2 * width * height))
+
+    def __len__(self):
+        return self.height
+
+    def raw(self, x, y):
+        return self.data[y * self.width + x]
+
+    def decode(self, value):
+        """Turn a packed value back into a marker string or {"sheet", "id"} dict."""
+        if not value:
+            return None
+        if self.logic:
+            return self.names[value - 1]
+        return {"sheet": self.names[(value >> TILE_ID_BITS) - 1], "id": value & TILE_ID_MASK}
+
+    def get(self, x, y):
+        return self.decode(self.data[y * self.width + x])
+
+    def __getitem__(self, y):
+        """Row accessor so `layer[y][x]` keeps working for old callers."""
+        start = y * self.width
+        return [self.decode(v) for v in self.data[start:start + self.width]]
+
+    def cells(self):
+        """Yield (x, y, value) for every non-empty cell."""
+        w = self.width
+        for i, v in enumerate(self.data):
+            if v:
+                yield i % w, i // w, self.decode(v)
+
 
 class TileMap:
     # Layers to draw in game
@@ -13,118 +87,424 @@ class TileMap:
     # Layers considered solid for collision
     SOLID_LAYERS = ["wall", "props", "shrines"]
 
+    # Layers that block light
+    OPAQUE_LAYERS = ["wall"]
+
     # Layers that store logic markers
     LOGIC_LAYERS = ["spawnpoints", "orb_spawn", "main_shrine_marker", "shrine_logic"]
 
-    def __init__(self, map_file, tile_size=32):
+    # Enforce correct draw order: props2 always on top of shrines
+    DRAW_ORDER = ["floor", "wall", "props", "shrines", "props2", "spawner"]
+
+    # Tiles per chunk side; drawing only visits chunks overlapping the view
+    CHUNK_SIZE = 16
+    # Cached chunks (1 MiB each when baked) kept before off-screen ones are dropped
+    MAX_CHUNKS = 64
+
+    def __init__(self, map_file, tile_size=32, baked=True, background=(10, 10, 10)):
         self.tile_size = tile_size
-        self.layers = {}
-        self.sheet_cache = {}   # full sheet surfaces
-        self.subtiles = {}      # individual tile surfaces per sheet
+        self.layers = {}        # layer name -> TileLayer
+        self.sheets = []        # interned sheet paths, indexed by packed value
+        self.sheet_ids = {}
+        self.marker_types = []  # interned logic marker strings
+        self.marker_ids = {}
+        self.atlas = get_atlas(tile_size)  # shared tile pixels; sheets are packed on first draw
+        self.sheet_ranges = {}  # sheet index -> (first atlas index, tile count)
+        self.chunk_tiles = {}   # (cx, cy) -> draw list for that chunk
+
+        # Baking mode: static layers are composited into one surface per chunk
+        self.baked = baked
+        self.background = background  # baked chunks are opaque over this colour
+        self.chunk_surfaces = {}      # (cx, cy) -> baked chunk surface
+        self.chunks_drawn = 0
+        self.tiles_drawn = 0
 
-        # Load JSON map
-        if not os.path.exists(map_file):
+        # map_file is a .json/.llmap path, or an already-parsed map dict
+        if isinstance(map_file, dict):
+            self.load_dict(map_file)
+        elif not os.path.exists(map_file):
             raise FileNotFoundError(f"Map file {map_file} not found")
+        elif is_binary_map(map_file):
+            self.load_binary(map_file)
+        else:
+            self.load_json(map_file)
+
+        self.chunks_x = -(-self.width // self.CHUNK_SIZE)
+        self.chunks_y = -(-self.height // self.CHUNK_SIZE)
+        self.revision = 0  # bumped on every runtime tile change
+        self.build_collision()
+
+    def load_json(self, map_file):
+        """Load the sparse JSON schema written by editor.py."""
         with open(map_file, encoding="utf-8") as f:
-            data = json.load(f)
+            self.load_dict(json.load(f))
 
+    def load_dict(self, data):
         self.width = data.get("width", 0)
         self.height = data.get("height", 0)
 
-        # Initialize empty 2D layers
+        # Initialize empty layers
         for lname in data.get("layers", {}):
-            self.layers[lname] = [[None for _ in range(self.width)] for _ in range(self.height)]
+            self.add_layer(lname)
 
         # Fill tiles from saved map
         for lname, tile_list in data.get("layers", {}).items():
-            layer_grid = self.layers[lname]
+            cells = self.layers[lname].data
+            logic = lname in self.LOGIC_LAYERS
             for t in tile_list:
                 x, y = t.get("x"), t.get("y")
                 if x is None or y is None:
                     continue
                 if 0 <= x < self.width and 0 <= y < self.height:
-                    if lname in self.LOGIC_LAYERS:
-                        layer_grid[y][x] = t.get("type", None)
+                    if logic:
+                        value = self.pack_marker(t.get("type", None))
                     else:
-                        sheet = t.get("sheet")
-                        tid = t.get("id")
-                        if sheet is not None and tid is not None:
-                            layer_grid[y][x] = {"sheet": sheet.replace("\\","/"), "id": tid}
-
-    def load_sheet(self, path):
-        """Load full tilesheet and cache it."""
-        if path not in self.sheet_cache:
-            if not os.path.exists(path):
-                raise FileNotFoundError(f"Tilesheet {path} not found")
-            sheet = pygame.image.load(path).convert_alpha()
-            self.sheet_cache[path] = sheet
-        return self.sheet_cache[path]
-
-    def get_subtiles(self, sheet_path):
-        """Split a sheet into individual tile surfaces and cache."""
-        if sheet_path in self.subtiles:
-            return self.subtiles[sheet_path]
-
-        sheet = self.load_sheet(sheet_path)
-        w, h = sheet.get_width(), sheet.get_height()
-        tiles = []
-        for y in range(0, h, self.tile_size):
-            for x in range(0, w, self.tile_size):
-                rect = pygame.Rect(x, y, self.tile_size, self.tile_size)
-                tiles.append(sheet.subsurface(rect).copy())
-        self.subtiles[sheet_path] = tiles
-        return tiles
+                        value = self.pack_tile(t.get("sheet"), t.get("id"))
+                    cells[y * self.width + x] = value
+
+    def load_binary(self, map_file):
+        """Load a .llmap file, mapping its cell grids instead of parsing them."""
+        with open(map_file, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, id_bits, self.width, self.height, n_sheets, n_markers, n_layers = \
+            MAP_HEADER.unpack_from(buf, 0)
+        if magic != MAP_MAGIC:
+            raise ValueError(f"{map_file} is not a binary map")
+        if id_bits != TILE_ID_BITS:
+            raise ValueError(f"{map_file} uses {id_bits}-bit tile ids, expected {TILE_ID_BITS}")
+        offset = MAP_HEADER.size
+
+        def read_string():
+            nonlocal offset
+            (length,) = struct.unpack_from("<H", buf, offset)
+            offset += 2 + length
+            return buf[offset - length:offset].decode("utf-8")
+
+        for _ in range(n_sheets):
+            self.sheets.append(read_string())
+            self.sheet_ids[self.sheets[-1]] = len(self.sheets)
+        for _ in range(n_markers):
+            self.marker_types.append(read_string())
+            self.marker_ids[self.marker_types[-1]] = len(self.marker_types)
+
+        view = memoryview(buf)
+        cells = self.width * self.height
+        for _ in range(n_layers):
+            lname = read_string()
+            logic = buf[offset] == 1
+            offset += 1 + (offset + 1) % 2
+            raw = view[offset:offset + 2 * cells]
+            offset += 2 * cells
+            if sys.byteorder == "little":
+                data = raw.cast("H")
+            else:
+                data = array("H", raw.tobytes())
+                data.byteswap()
+            names = self.marker_types if logic else self.sheets
+            self.layers[lname] = TileLayer(self.width, self.height, names, logic=logic, data=data)
+
+    def save_binary(self, map_file):
+        """Write the map in the binary .llmap format."""
+        def string(text):
+            raw = text.encode("utf-8")
+            return struct.pack("<H", len(raw)) + raw
+
+        out = bytearray(MAP_HEADER.pack(
+            MAP_MAGIC, TILE_ID_BITS, self.width, self.height,
+            len(self.sheets), len(self.marker_types), len(self.layers)
+        ))
+        for name in self.sheets + self.marker_types:
+            out += string(name)
+        for lname, layer in self.layers.items():
+            out += string(lname)
+            out.append(1 if layer.logic else 0)
+            if len(out) % 2:
+                out.append(0)
+            data = array("H", layer.data)
+            if sys.byteorder != "little":
+                data.byteswap()
+            out += data.tobytes()
+
+        with open(map_file, "wb") as f:
+            f.write(out)
+
+    def to_dict(self):
+        """Return the map in the sparse JSON schema used by editor.py."""
+        map_data = {"width": self.width, "height": self.height, "layers": {}}
+        for lname, layer in self.layers.items():
+            tiles = map_data["layers"][lname] = []
+            for x, y, tile in layer.cells():
+                if layer.logic:
+                    tiles.append({"x": x, "y": y, "type": tile})
+                else:
+                    tiles.append({"x": x, "y": y, "sheet": tile["sheet"], "id": tile["id"]})
+        return map_data
+
+    def save_json(self, map_file):
+        with open(map_file, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4)
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        """Draw visible layers on screen in order."""
-        # Enforce correct draw order: props2 always on top of shrines
-        draw_order = ["floor", "wall", "props", "shrines", "props2", "spawner"]
-        for lname in draw_order:
+    def add_layer(self, lname):
+        logic = lname in self.LOGIC_LAYERS
+        names = self.marker_types if logic else self.sheets
+        self.layers[lname] = TileLayer(self.width, self.height, names, logic=logic)
+        return self.layers[lname]
+
+    def pack_tile(self, sheet, tid):
+        """Intern `sheet` and pack it with `tid` into one uint16 value."""
+        if sheet is None or tid is None:
+            return 0
+        if not 0 <= tid <= TILE_ID_MASK:
+            raise ValueError(f"Tile id {tid} does not fit in {TILE_ID_BITS} bits")
+        sheet = sheet.replace("\\", "/")
+        if sheet not in self.sheet_ids:
+            if len(self.sheets) >= 0xFFFF >> TILE_ID_BITS:
+                raise ValueError("Too many tilesheets for packed tile storage")
+            self.sheets.append(sheet)
+            self.sheet_ids[sheet] = len(self.sheets)
+        return (self.sheet_ids[sheet] << TILE_ID_BITS) | tid
+
+    def pack_marker(self, marker):
+        if not marker:
+            return 0
+        if marker not in self.marker_ids:
+            self.marker_types.append(marker)
+            self.marker_ids[marker] = len(self.marker_types)
+        return self.marker_ids[marker]
+
+    def cell_blocked(self, idx):
+        """True if the flat cell index has a solid tile or no floor."""
+        for lname in self.SOLID_LAYERS:
+            layer = self.layers.get(lname)
+            if layer and layer.data[idx]:
+                return True
+        floor_layer = self.layers.get("floor")
+        return not floor_layer or not floor_layer.data[idx]
+
+    def build_collision(self):
+        """Precompute the walkability grid: 1 = blocked, 0 = walkable."""
+        if np is None:
+            self.blocked = bytearray(self.cell_blocked(i) for i in range(self.width * self.height))
+            return
+
+        floor_layer = self.layers.get("floor")
+        if floor_layer:
+            blocked = np.frombuffer(floor_layer.data, dtype=np.uint16) == 0
+        else:
+            blocked = np.ones(self.width * self.height, dtype=bool)
+        for lname in self.SOLID_LAYERS:
+            layer = self.layers.get(lname)
+            if layer:
+                blocked |= np.frombuffer(layer.data, dtype=np.uint16) != 0
+        self.blocked = bytearray(blocked.astype(np.uint8).tobytes())
+
+    def cells(self, lname):
+        """Yield (x, y, value) for non-empty cells of a layer, if it exists."""
+        layer = self.layers.get(lname)
+        return layer.cells() if layer else iter(())
+
+    def tile_source(self, value):
+        """(atlas page, rect) for a packed tile value, or None if the id is out of range."""
+        sheet = (value >> TILE_ID_BITS) - 1
+        tile_range = self.sheet_ranges.get(sheet)
+        if tile_range is None:
+            first, cols, rows = self.atlas.add_sheet(self.sheets[sheet])
+            tile_range = self.sheet_ranges[sheet] = (first, cols * rows)
+        idx = value & TILE_ID_MASK
+        return self.atlas.source(tile_range[0] + idx) if idx < tile_range[1] else None
+
+    def visible_chunks(self, surface, camera_x=0, camera_y=0):
+        """Return the range of chunk coords overlapping the camera view."""
+        view_w, view_h = surface.get_size()
+        chunk_px = self.CHUNK_SIZE * self.tile_size
+        cx0 = max(0, int(camera_x) // chunk_px)
+        cy0 = max(0, int(camera_y) // chunk_px)
+        cx1 = min(self.chunks_x, (int(camera_x) + view_w - 1) // chunk_px + 1)
+        cy1 = min(self.chunks_y, (int(camera_y) + view_h - 1) // chunk_px + 1)
+        return range(cx0, cx1), range(cy0, cy1)
+
+    def get_chunk_tiles(self, cx, cy):
+        """Build (and cache) the draw list of one chunk in draw order."""
+        key = (cx, cy)
+        if key in self.chunk_tiles:
+            return self.chunk_tiles[key]
+
+        x0, y0 = cx * self.CHUNK_SIZE, cy * self.CHUNK_SIZE
+        x1 = min(self.width, x0 + self.CHUNK_SIZE)
+        y1 = min(self.height, y0 + self.CHUNK_SIZE)
+        tiles = []
+        for lname in self.DRAW_ORDER:
             layer = self.layers.get(lname)
             if not layer:
                 continue
-            for y, row in enumerate(layer):
-                for x, t in enumerate(row):
-                    if t is None:
-                        continue
-                    if isinstance(t, dict) and "sheet" in t:
-                        tiles = self.get_subtiles(t["sheet"])
-                        idx = t["id"]
-                        if 0 <= idx < len(tiles):
-                            surface.blit(
-                                tiles[idx],
-                                (x*self.tile_size - camera_x, y*self.tile_size - camera_y)
-                            )
+            cells = layer.data
+            for y in range(y0, y1):
+                row = y * self.width
+                for x in range(x0, x1):
+                    value = cells[row + x]
+                    if value:
+                        tiles.append((x * self.tile_size, y * self.tile_size, value))
+        self.chunk_tiles[key] = tiles
+        return tiles
 
-    def is_solid(self, rect):
-        """Check if a player's rect collides with solid tiles or steps off the floor."""
+    def bake_chunk(self, cx, cy):
+        """Composite the static layers of one chunk into a single surface."""
+        chunk_px = self.CHUNK_SIZE * self.tile_size
+        w = min(chunk_px, self.width * self.tile_size - cx * chunk_px)
+        h = min(chunk_px, self.height * self.tile_size - cy * chunk_px)
+        surf = pygame.Surface((w, h))
+        if pygame.display.get_surface():
+            surf = surf.convert()
+        surf.fill(self.background)
+
+        ox, oy = cx * chunk_px, cy * chunk_px
+        blits = []
+        for px, py, value in self.get_chunk_tiles(cx, cy):
+            source = self.tile_source(value)
+            if source:
+                blits.append((source[0], (px - ox, py - oy), source[1]))
+        surf.blits(blits, doreturn=False)
+        self.chunk_surfaces[(cx, cy)] = surf
+        self.chunk_tiles.pop((cx, cy), None)  # the surface is all a baked chunk needs
+        return surf
+
+    def bake_all(self, around=None):
+        """Bake chunks at load instead of on first sight, up to MAX_CHUNKS
+        (every chunk of a small map), nearest the tile `around` first."""
+        keys = [(cx, cy) for cy in range(self.chunks_y) for cx in range(self.chunks_x)]
+        if around is not None:
+            ax, ay = around[0] // self.CHUNK_SIZE, around[1] // self.CHUNK_SIZE
+            keys.sort(key=lambda key: (key[0] - ax) ** 2 + (key[1] - ay) ** 2)
+        for key in keys:
+            if len(self.chunk_surfaces) >= self.MAX_CHUNKS:
+                return
+            if key not in self.chunk_surfaces:
+                self.bake_chunk(*key)
+
+    def evict_chunks(self, cache, xs, ys):
+        """Past MAX_CHUNKS, drop the cached chunks outside the view."""
+        if len(cache) > self.MAX_CHUNKS:
+            for key in [key for key in cache if key[0] not in xs or key[1] not in ys]:
+                del cache[key]
+
+    def invalidate_chunk(self, cx, cy):
+        """Drop cached data for a chunk so it is rebuilt on next draw."""
+        self.chunk_tiles.pop((cx, cy), None)
+        self.chunk_surfaces.pop((cx, cy), None)
+
+    def invalidate_tile(self, x, y):
+        """Mark the chunk containing tile (x, y) as dirty."""
+        self.invalidate_chunk(x // self.CHUNK_SIZE, y // self.CHUNK_SIZE)
+
+    def set_tile(self, lname, x, y, value):
+        """Change a tile at runtime and re-bake only its chunk."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        layer = self.layers.get(lname) or self.add_layer(lname)
+        if isinstance(value, dict):
+            value = self.pack_tile(value["sheet"], value["id"])
+        elif layer.logic:
+            value = self.pack_marker(value)
+        layer.data[y * self.width + x] = value or 0
+        self.revision += 1
+        if lname in self.SOLID_LAYERS or lname == "floor":
+            idx = y * self.width + x
+            self.blocked[idx] = self.cell_blocked(idx)
+        if lname in self.DRAW_ORDER:
+            self.invalidate_tile(x, y)
+
+    def draw(self, surface, camera_x=0, camera_y=0, queue=None):
+        """Draw visible layers on screen in order, touching only on-screen chunks.
+        With a RenderQueue the blits are queued on its world layer instead."""
+        xs, ys = self.visible_chunks(surface, camera_x, camera_y)
+        self.chunks_drawn = len(xs) * len(ys)  # per-frame stats for profiling
+        self.tiles_drawn = 0
+        blits = []
+        if self.baked:
+            chunk_px = self.CHUNK_SIZE * self.tile_size
+            for cy in ys:
+                for cx in xs:
+                    chunk = self.chunk_surfaces.get((cx, cy)) or self.bake_chunk(cx, cy)
+                    blits.append((chunk, (cx * chunk_px - camera_x, cy * chunk_px - camera_y), None, 0))
+            self.evict_chunks(self.chunk_surfaces, xs, ys)
+        else:
+            for cy in ys:
+                for cx in xs:
+                    for px, py, value in self.get_chunk_tiles(cx, cy):
+                        source = self.tile_source(value)
+                        if source:
+                            blits.append((source[0], (px - camera_x, py - camera_y), source[1], 0))
+            self.tiles_drawn = len(blits)
+            self.evict_chunks(self.chunk_tiles, xs, ys)
+        if queue is not None:
+            queue.extend(blits, LAYER_WORLD)
+        else:
+            surface.blits(blits, doreturn=False)
+
+    def foot_points(self, rect):
+        """The three probe points along the bottom edge of a rect."""
         foot_y = rect.bottom - 1
-        points_to_check = [
+        return (
             (rect.left + 2, foot_y),
             (rect.right - 3, foot_y),
             (rect.centerx, foot_y)
-        ]
+        )
 
-        for px, py in points_to_check:
-            tile_x = px // self.tile_size
-            tile_y = py // self.tile_size
-
-            # Out-of-bounds counts as solid
-            if tile_x < 0 or tile_x >= self.width or tile_y < 0 or tile_y >= self.height:
-                # print(f"[DEBUG] Out of bounds collision at {tile_x},{tile_y}")
+    def is_opaque(self, tile_x, tile_y):
+        """True if the tile blocks light; out-of-bounds tiles do not."""
+        if tile_x < 0 or tile_x >= self.width or tile_y < 0 or tile_y >= self.height:
+            return False
+        idx = tile_y * self.width + tile_x
+        for lname in self.OPAQUE_LAYERS:
+            layer = self.layers.get(lname)
+            if layer and layer.data[idx]:
                 return True
+        return False
 
-            # Check solid layers first
-            for lname in self.SOLID_LAYERS:
-                layer = self.layers.get(lname, [])
-                if layer and layer[tile_y][tile_x]:
-                    # print(f"[DEBUG] Collided with {lname} at ({tile_x},{tile_y})")
-                    return True
-
-            # Check if there is floor beneath; if not, it's "solid" (cannot walk off)
-            floor_layer = self.layers.get("floor", [])
-            if not floor_layer or not floor_layer[tile_y][tile_x]:
-                # print(f"[DEBUG] No floor at ({tile_x},{tile_y})")
+    def tile_blocked(self, tile_x, tile_y):
+        """Out-of-bounds counts as solid."""
+        if tile_x < 0 or tile_x >= self.width or tile_y < 0 or tile_y >= self.height:
+            return True
+        return self.blocked[tile_y * self.width + tile_x] == 1
+
+    def is_solid(self, rect):
+        """Check if a player's rect collides with solid tiles or steps off the floor."""
+        ts, w, h, blocked = self.tile_size, self.width, self.height, self.blocked
+        for px, py in self.foot_points(rect):
+            tile_x = px // ts
+            tile_y = py // ts
+            if tile_x < 0 or tile_x >= w or tile_y < 0 or tile_y >= h or blocked[tile_y * w + tile_x]:
                 return True
+        return False
+
+    def points_solid(self, points):
+        """Batch query: one bool per (x, y) pixel point, True where blocked."""
+        if np is None:
+            ts = self.tile_size
+            return [self.tile_blocked(int(px) // ts, int(py) // ts) for px, py in points]
+
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        tx = pts[:, 0] // self.tile_size
+        ty = pts[:, 1] // self.tile_size
+        inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+        result = np.ones(len(pts), dtype=bool)
+        grid = np.frombuffer(self.blocked, dtype=np.uint8)
+        result[inside] = grid[ty[inside] * self.width + tx[inside]] != 0
+        return result
+
+    def rects_solid(self, rects):
+        """Batch version of is_solid: one bool per rect. `rects` is an (N, 4)
+        array or a sequence of (x, y, w, h)."""
+        if np is None:
+            return [self.is_solid(pygame.Rect(rect)) for rect in rects]
 
-        return False
\ No newline at end of file
+        r = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+        x, y, w, h = r[:, 0], r[:, 1], r[:, 2], r[:, 3]
+        foot_y = y + h - 1
+        points = np.empty((len(r), 3, 2), dtype=np.int64)
+        points[:, 0, 0] = x + 2       # same probes as foot_points()
+        points[:, 1, 0] = x + w - 3
+        points[:, 2, 0] = x + w // 2
+        points[:, :, 1] = foot_y[:, None]
+        return self.points_solid(points.reshape(-1, 2)).reshape(-1, 3).any(axis=1)
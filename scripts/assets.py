@@ -0,0 +1,152 @@
+"""Central loading of images and sounds under assets/.
+
+The manifest is every image and sound file found under the asset root.
+preload() decodes them on a thread pool (typically while the menu is up);
+pump() converts decoded images for the display on the main thread, a few per
+frame. image()/sound() return the prepared asset, waiting for or loading it
+on the spot only if preloading has not got to it yet. Everything is keyed by
+normalised path, so each file is read from disk once per process.
+"""
+import os, sys
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+SOUND_EXTS = (".wav", ".ogg", ".mp3", ".flac")
+
+
+def _decode_image(path):
+    return pygame.image.load(path)
+
+
+def _decode_sound(path):
+    return pygame.mixer.Sound(path)
+
+
+class AssetManager:
+    def __init__(self, root="assets", workers=4):
+        self.root = root
+        self.workers = workers
+        self.executor = None
+        self.pending = {}  # path -> Future of the decoded asset
+        self.images = {}   # path -> display-ready surface
+        self.sounds = {}   # path -> Sound
+        self.failed = {}     # path -> exception from a background load
+        self.streamed = set()  # long audio played from disk, never decoded up front
+        self._manifest = None
+
+    @staticmethod
+    def key(path):
+        return os.path.relpath(path)  # normalised and cwd-relative, so absolute paths dedupe too
+
+    def manifest(self):
+        """Sorted image and sound paths under the asset root."""
+        if self._manifest is None:
+            paths = []
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    if name.lower().endswith(IMAGE_EXTS + SOUND_EXTS):
+                        paths.append(self.key(os.path.join(dirpath, name)))
+            self._manifest = sorted(paths)
+        return self._manifest
+
+    def is_sound(self, path):
+        return path.lower().endswith(SOUND_EXTS)
+
+    def submit(self, fn, *args):
+        """Run any other loading work (e.g. parsing a map) on the asset threads."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="assets")
+        return self.executor.submit(fn, *args)
+
+    def preload(self, paths=None):
+        """Start decoding `paths` (default: the whole manifest) in the background."""
+        for path in (self.manifest() if paths is None else map(self.key, paths)):
+            if path in self.pending or path in self.images or path in self.sounds or path in self.failed:
+                continue
+            if path in self.streamed:
+                continue
+            if self.is_sound(path):
+                if not pygame.mixer.get_init():
+                    continue  # sounds are decoded into the mixer's format
+                self.pending[path] = self.submit(_decode_sound, path)
+            else:
+                self.pending[path] = self.submit(_decode_image, path)
+
+    def stream(self, path):
+        """Mark `path` as streamed, so preloading leaves it on disk."""
+        self.streamed.add(self.key(path))
+
+    def progress(self):
+        """(finished, total) for everything requested so far."""
+        done = len(self.images) + len(self.sounds) + sum(f.done() for f in self.pending.values())
+        return done, len(self.images) + len(self.sounds) + len(self.pending)
+
+    def done(self):
+        return all(f.done() for f in self.pending.values())
+
+    def pump(self, limit=4):
+        """Finish up to `limit` decoded assets on the main thread; call once per frame."""
+        for path in [p for p, f in self.pending.items() if f.done()][:limit]:
+            self._finish_quietly(path)
+
+    def wait(self):
+        """Block until every requested asset is decoded and ready."""
+        for path in list(self.pending):
+            self._finish_quietly(path)
+
+    def _finish_quietly(self, path):
+        # A broken file should not take down the menu; it is reported, and
+        # raised again if something actually asks for it
+        try:
+            self._finish(path)
+        except (OSError, pygame.error) as e:
+            self.failed[path] = e
+            print(f"[assets] could not load {path}: {e}", file=sys.stderr)
+
+    def _finish(self, path):
+        return self._store(path, self.pending.pop(path).result())
+
+    def _store(self, path, asset):
+        if self.is_sound(path):
+            self.sounds[path] = asset
+        else:
+            # Converting needs a display; headless runs keep the raw surface
+            if pygame.display.get_surface():
+                asset = asset.convert_alpha()
+            self.images[path] = asset
+        return asset
+
+    def image(self, path):
+        path = self.key(path)
+        surf = self.images.get(path)
+        if surf is None:
+            if path in self.pending:
+                return self._finish(path)
+            if path in self.failed:
+                raise self.failed[path]
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Image {path} not found")
+            surf = self._store(path, _decode_image(path))
+        return surf
+
+    def sound(self, path):
+        path = self.key(path)
+        snd = self.sounds.get(path)
+        if snd is None:
+            if path in self.pending:
+                return self._finish(path)
+            if path in self.failed:
+                raise self.failed[path]
+            snd = self._store(path, _decode_sound(path))
+        return snd
+
+    def shutdown(self):
+        """Drop queued work so exiting does not wait for it."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+# Shared by everything that loads from assets/
+asset_manager = AssetManager()
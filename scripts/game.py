@@ -0,0 +1,146 @@
+"""Game rules for one playthrough, separated from input polling and drawing.
+
+Simulation.step() advances the world by a fixed dt given a movement vector,
+so it can be driven by the keyboard in main.py or by a script with no
+display at all:
+
+    python -m scripts.game --ticks 10000
+"""
+import time, argparse
+from scripts.Tilemap import TileMap
+from scripts.player import Player
+from scripts.orb import Orb
+from scripts.shrine import ShrineManager
+from scripts.message_manager import MessageManager
+from scripts.spatial import SpatialHash
+from scripts.profiler import NULL_PROFILER
+
+SIM_DT = 1 / 60
+
+COMPLETION_TEXT = "The six Spheres are whole. The original light is reborn through your courage, Bringer of Dawn. Now, command the dawn!"
+
+
+class Simulation:
+    def __init__(self, tilemap, view_size=(800, 600), font=None, profiler=NULL_PROFILER):
+        self.tilemap = tilemap
+        self.profiler = profiler
+        self.view_size = view_size
+        self.player = None
+        self.orbs = []
+        self.orb_index = SpatialHash(tilemap.tile_size)
+
+        # Spawn player
+        for x, y, tile_type in tilemap.cells("spawnpoints"):
+            if tile_type.lower() == "player":
+                world_x = x * tilemap.tile_size
+                world_y = y * tilemap.tile_size
+                self.player = Player(world_x, world_y, tilemap)
+        if self.player is None:
+            raise RuntimeError("No player spawn found!")
+
+        # Spawn orbs
+        for x, y, marker in tilemap.cells("orb_spawn"):
+            if marker.lower() == "orb":
+                orb_size = 24
+                orb = Orb(x, y, width=orb_size, height=orb_size)
+                self.orbs.append(orb)
+                self.orb_index.insert(orb, orb.get_rect(tilemap.tile_size))
+        self.total_orbs = len(self.orbs)
+        self.orbs_collected = 0
+
+        self.message_manager = MessageManager(font)
+        self.shrine_manager = ShrineManager(tilemap, self.total_orbs)
+
+        self.player_at_main_shrine = False
+        self.completed = False
+        self.tick = 0
+        self.time = 0.0
+        self.events = []  # ("orb_collected", orb) / ("completed", None) raised by the last step
+
+    def step(self, dt=SIM_DT, move=(0, 0)):
+        """Advance one tick; `move` is the (dx, dy) input in -1..1."""
+        self.events = []
+        self.tick += 1
+        self.time += dt
+        player = self.player
+        prof = self.profiler
+        prof.count("sim_steps")
+
+        # Player update
+        with prof.scope("player.update"):
+            if not getattr(player, "disable_input", False):
+                player.set_movement(*move)
+            player.update(dt)
+
+        # Orb pickups: only orbs under the player are tested
+        with prof.scope("orbs.update"):
+            for orb in self.orb_index.query_rect(player.hitbox):
+                if orb.check_collision(player.hitbox):
+                    orb.collected = True
+                    self.orb_index.remove(orb)
+                    self.orbs_collected += 1
+                    self.events.append(("orb_collected", orb))
+
+        # Shrine update
+        with prof.scope("shrines.update"):
+            self.shrine_manager.update(player, self.message_manager, self.orbs_collected, dt, view_size=self.view_size)
+        main_shrine = self.shrine_manager.main_shrine
+        if main_shrine and self.orbs_collected == self.total_orbs and player.rect.colliderect(main_shrine.rect):
+            self.player_at_main_shrine = True
+        self.message_manager.update(dt)
+
+        # Check completion
+        if self.player_at_main_shrine and self.orbs_collected == self.total_orbs and not self.completed:
+            self.completed = True
+            self.message_manager.add_message(COMPLETION_TEXT, duration_seconds=4, priority=2)
+            self.events.append(("completed", None))
+        return self.events
+
+    def camera(self, alpha=1.0):
+        """Top-left of the view, clamped to the map, following the player
+        interpolated `alpha` of the way between the last two ticks."""
+        view_w, view_h = self.view_size
+        ts = self.tilemap.tile_size
+        ox, oy = self.player.render_offset(alpha)
+        camera_x = max(0, min(self.player.rect.centerx + ox - view_w // 2, self.tilemap.width * ts - view_w))
+        camera_y = max(0, min(self.player.rect.centery + oy - view_h // 2, self.tilemap.height * ts - view_h))
+        return camera_x, camera_y
+
+
+class ScriptedInput:
+    """Replays (ticks, dx, dy) segments in a loop as movement input."""
+
+    def __init__(self, segments):
+        self.segments = segments
+        self.length = sum(ticks for ticks, _, _ in segments)
+
+    def __call__(self, tick):
+        t = tick % self.length
+        for ticks, dx, dy in self.segments:
+            if t < ticks:
+                return dx, dy
+            t -= ticks
+        return 0, 0
+
+
+def run_headless(tilemap, ticks, controls=None, dt=SIM_DT):
+    """Step a fresh simulation `ticks` times without drawing; stops early on completion."""
+    controls = controls or (lambda tick: (0, 0))
+    sim = Simulation(tilemap)
+    start = time.perf_counter()
+    while sim.tick < ticks and not sim.completed:
+        sim.step(dt, controls(sim.tick))
+    elapsed = time.perf_counter() - start
+    return sim, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the game simulation headless.")
+    parser.add_argument("--map", default="map.json")
+    parser.add_argument("--ticks", type=int, default=10000)
+    args = parser.parse_args()
+
+    walk = ScriptedInput([(120, 1, 0), (120, 0, -1), (120, -1, 0), (120, 0, 1)])
+    sim, elapsed = run_headless(TileMap(args.map), args.ticks, walk)
+    print(f"{sim.tick} ticks in {elapsed:.3f}s ({sim.tick / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"player at {sim.player.hitbox.topleft}, orbs {sim.orbs_collected}/{sim.total_orbs}, completed={sim.completed}")
@@ -1,6 +1,283 @@
-import pygame
+import pygame, math
+from collections import OrderedDict
+from scripts.render_queue import RenderQueue, LAYER_LIGHTING
+
+# Light stamps are cached by quantized size/intensity so the fog pass does not
+# allocate a new surface per light per frame. The cache is bounded by total
+# pixel area, since one screen-sized stamp outweighs hundreds of small ones.
+STAMP_CACHE_PIXELS = 4_000_000  # ~16 MB of SRCALPHA stamps
+RADIUS_STEP = 2        # px; radii are rounded to this step
+INTENSITY_STEP = 8     # alpha levels are rounded to this step
+FALLOFF_RING = 2       # px between gradient rings
+LARGE_STAMP = 128      # px; bigger stamps are scaled up from one gradient of this radius
+SHADOW_RAYS = 72       # rays cast per visibility polygon
+SHADOW_CACHE_SIZE = 64
+SHADOW_OFFSET_STEP = 8  # px; masks are shared by lights within the same step of a tile
+
+
+class StampCache:
+    """LRU of stamps holding at most `max_pixels` in total.
+    Items over a quarter of the budget, like the ending's ever-growing light,
+    are handed back without being kept."""
+
+    def __init__(self, max_pixels=STAMP_CACHE_PIXELS):
+        self.max_pixels = max_pixels
+        self.pixels = 0
+        self.items = OrderedDict()  # key -> (stamp, pixels)
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key):
+        entry = self.items.get(key)
+        if entry is None:
+            return None
+        self.items.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, stamp, pixels):
+        if pixels > self.max_pixels // 4:
+            return stamp
+        self.items[key] = (stamp, pixels)
+        self.pixels += pixels
+        while self.pixels > self.max_pixels:
+            self.pixels -= self.items.popitem(last=False)[1][1]
+        return stamp
+
+    def clear(self):
+        self.items.clear()
+        self.pixels = 0
+
+
+_stamp_cache = StampCache()
+_gradients = {}  # (intensity, color) -> stamp of radius LARGE_STAMP
+
+
+def quantize(value, step):
+    return max(step, int(round(value / step)) * step)
+
+
+def make_light_stamp(radius_w, radius_h, intensity, color=(255, 255, 200)):
+    """Build a soft radial-gradient ellipse, brightest at the centre."""
+    if max(radius_w, radius_h) > LARGE_STAMP:
+        return make_large_stamp(radius_w, radius_h, intensity, color=color)[0]
+    stamp = pygame.Surface((radius_w*2, radius_h*2), pygame.SRCALPHA)
+    rings = max(1, max(radius_w, radius_h) // FALLOFF_RING)
+    # Draw from the outside in; each ring overwrites the centre with more alpha
+    for i in range(rings):
+        d = 1 - i / rings  # normalized distance from the centre
+        alpha = int(intensity * (1 - d * d))
+        w, h = radius_w * 2 * d, radius_h * 2 * d
+        rect = pygame.Rect(0, 0, max(1, int(w)), max(1, int(h)))
+        rect.center = (radius_w, radius_h)
+        pygame.draw.ellipse(stamp, (*color, alpha), rect)
+    return stamp
+
+
+def make_large_stamp(radius_w, radius_h, intensity, area=None, color=(255, 255, 200)):
+    """Stamp for a light bigger than LARGE_STAMP, smoothscaled from one cached
+    gradient since drawing ring by ring is O(radius). With `area` (a Rect in
+    stamp coordinates) only that part is built. Returns (stamp, its top-left
+    within the full stamp)."""
+    gradient = _gradients.get((intensity, color))
+    if gradient is None:
+        gradient = _gradients[(intensity, color)] = make_light_stamp(LARGE_STAMP, LARGE_STAMP, intensity, color)
+    g = gradient.get_width()
+    sx, sy = g / (radius_w * 2), g / (radius_h * 2)
+    area = area or pygame.Rect(0, 0, radius_w * 2, radius_h * 2)
+    # Gradient pixels covering `area`, widened to whole pixels
+    x0, y0 = int(area.left * sx), int(area.top * sy)
+    x1, y1 = min(g, math.ceil(area.right * sx)), min(g, math.ceil(area.bottom * sy))
+    left, top = round(x0 / sx), round(y0 / sy)
+    size = (round(x1 / sx) - left, round(y1 / sy) - top)
+    return pygame.transform.smoothscale(gradient.subsurface(x0, y0, x1 - x0, y1 - y0), size), (left, top)
+
+
+def light_key(radius_w, radius_h, intensity):
+    return (quantize(radius_w, RADIUS_STEP), quantize(radius_h, RADIUS_STEP),
+            min(255, quantize(intensity, INTENSITY_STEP)))
+
+
+def get_light_stamp(radius_w, radius_h, intensity):
+    """Return a cached stamp for the quantized (radius_w, radius_h, intensity)."""
+    key = light_key(radius_w, radius_h, intensity)
+    stamp = _stamp_cache.get(key)
+    if stamp is None:
+        stamp = _stamp_cache.put(key, make_light_stamp(*key), 4 * key[0] * key[1])
+    return stamp
+
+
+def cast_ray(tilemap, origin, angle, max_dist):
+    """Walk the tile grid from `origin` (world px) and return the distance to
+    the first opaque tile, or `max_dist`. The origin's own tile is ignored."""
+    ox, oy = origin
+    ts = tilemap.tile_size
+    dx, dy = math.cos(angle), math.sin(angle)
+    tx, ty = int(ox // ts), int(oy // ts)
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    t_delta_x = ts / abs(dx) if dx else math.inf
+    t_delta_y = ts / abs(dy) if dy else math.inf
+    t_max_x = ((tx + (dx > 0)) * ts - ox) / dx if dx else math.inf
+    t_max_y = ((ty + (dy > 0)) * ts - oy) / dy if dy else math.inf
+
+    while True:
+        if t_max_x < t_max_y:
+            t, tx = t_max_x, tx + step_x
+            t_max_x += t_delta_x
+        else:
+            t, ty = t_max_y, ty + step_y
+            t_max_y += t_delta_y
+        if t >= max_dist:
+            return max_dist
+        if tilemap.is_opaque(tx, ty):
+            return t
+
+
+def visibility_polygon(tilemap, origin, max_dist, rays=SHADOW_RAYS):
+    """Points (world px) of the area visible from `origin` within `max_dist`."""
+    points = []
+    for i in range(rays):
+        angle = 2 * math.pi * i / rays
+        dist = cast_ray(tilemap, origin, angle, max_dist)
+        points.append((origin[0] + math.cos(angle) * dist, origin[1] + math.sin(angle) * dist))
+    return points
+
 
 def draw_light(surface, position, radius_w, radius_h, intensity=100):
-    light_surf = pygame.Surface((radius_w*2, radius_h*2), pygame.SRCALPHA)
-    pygame.draw.ellipse(light_surf, (255, 255, 200, intensity), (0, 0, radius_w*2, radius_h*2))
-    surface.blit(light_surf, (position[0]-radius_w, position[1]-radius_h), special_flags=pygame.BLEND_RGBA_SUB)
+    stamp = get_light_stamp(radius_w, radius_h, intensity)
+    w, h = stamp.get_size()
+    surface.blit(stamp, (position[0] - w // 2, position[1] - h // 2), special_flags=pygame.BLEND_RGBA_SUB)
+
+
+class Lighting:
+    """Owns the fog-of-war buffer and subtracts lights out of it each frame.
+
+    Each light is queued as a BLEND_RGBA_SUB blit, and the frame's lights and
+    glows are submitted to the fog in order, in Surface.blits batches.
+
+    With an `occluder` tilemap, lights added with shadows=True are masked by
+    a visibility polygon cast against its opaque layers. Polygons are cast
+    from the centre of the light's tile and cached until the light changes
+    tile or the map revision changes. Masked stamps are cached per tile and
+    SHADOW_OFFSET_STEP offset within it, so static lights cost nothing after
+    their first frame and moving ones only rebuild a mask every few steps.
+    """
+
+    def __init__(self, size, darkness=220, occluder=None):
+        self.darkness = darkness
+        self.occluder = occluder
+        self.camera = (0, 0)
+        self.polygons = OrderedDict()  # (tile, reach, revision) -> polygon
+        self.masked = StampCache()     # (tile, offset, light key, revision) -> masked stamp
+        self.fog = None
+        self.fog_queue = RenderQueue()  # this frame's lights and glows
+        self.resize(size)
+        self.lights_drawn = 0
+        self.lights_culled = 0
+
+    def resize(self, size):
+        if self.fog is not None and self.fog.get_size() == tuple(size):
+            return
+        self.fog = pygame.Surface(size, pygame.SRCALPHA)
+
+    def clear(self, size=None, camera=(0, 0)):
+        """Start a new frame, following the display size if it changed."""
+        if size is not None:
+            self.resize(size)
+        self.camera = camera
+        self.fog_queue.clear()
+        self.fog.fill((0, 0, 0, self.darkness))
+        self.lights_drawn = 0
+        self.lights_culled = 0
+
+    def on_screen(self, position, radius_w, radius_h):
+        w, h = self.fog.get_size()
+        x, y = position
+        return x + radius_w > 0 and x - radius_w < w and y + radius_h > 0 and y - radius_h < h
+
+    def add_light(self, position, radius_w, radius_h, intensity=100, shadows=False):
+        """Subtract a light from the fog; lights fully off-screen are skipped."""
+        if not self.on_screen(position, radius_w, radius_h):
+            self.lights_culled += 1
+            return False
+        if shadows and self.occluder is not None:
+            self.queue_light(self.shadowed_light(position, radius_w, radius_h, intensity), position)
+        elif max(radius_w, radius_h) > LARGE_STAMP:
+            self.add_large_light(position, radius_w, radius_h, intensity)
+        else:
+            self.queue_light(get_light_stamp(radius_w, radius_h, intensity), position)
+        self.lights_drawn += 1
+        return True
+
+    def queue_light(self, stamp, position):
+        w, h = stamp.get_size()
+        self.fog_queue.add(stamp, (position[0] - w // 2, position[1] - h // 2), flags=pygame.BLEND_RGBA_SUB)
+
+    def add_large_light(self, position, radius_w, radius_h, intensity):
+        """Lights bigger than LARGE_STAMP (like the ending's growing light) are
+        built fresh over just their on-screen part rather than cached whole."""
+        rw, rh, level = light_key(radius_w, radius_h, intensity)
+        rect = pygame.Rect(0, 0, rw * 2, rh * 2)
+        rect.center = (int(position[0]), int(position[1]))
+        area = rect.clip(self.fog.get_rect()).move(-rect.left, -rect.top)
+        stamp, (left, top) = make_large_stamp(rw, rh, level, area)
+        self.fog_queue.add(stamp, (rect.left + left, rect.top + top), flags=pygame.BLEND_RGBA_SUB)
+
+    def light_polygon(self, world_pos, reach):
+        """Visibility polygon cast from the centre of the tile at `world_pos`."""
+        ts = self.occluder.tile_size
+        tile = (int(world_pos[0] // ts), int(world_pos[1] // ts))
+        key = (tile, reach, self.occluder.revision)
+        polygon = self.polygons.get(key)
+        if polygon is None:
+            centre = (tile[0] * ts + ts / 2, tile[1] * ts + ts / 2)
+            polygon = visibility_polygon(self.occluder, centre, reach)
+            self.polygons[key] = polygon
+            if len(self.polygons) > SHADOW_CACHE_SIZE:
+                self.polygons.popitem(last=False)
+        else:
+            self.polygons.move_to_end(key)
+        return polygon
+
+    def shadowed_light(self, position, radius_w, radius_h, intensity):
+        """Light stamp masked by the visibility polygon."""
+        ts, step = self.occluder.tile_size, SHADOW_OFFSET_STEP
+        wx, wy = int(position[0] + self.camera[0]), int(position[1] + self.camera[1])
+        tile = (wx // ts, wy // ts)
+        offset = (wx % ts // step * step + step // 2, wy % ts // step * step + step // 2)
+        rw, rh, level = light_key(radius_w, radius_h, intensity)
+        key = (tile, offset, rw, rh, level, self.occluder.revision)
+        light = self.masked.get(key)
+        if light is not None:
+            return light
+
+        stamp = get_light_stamp(rw, rh, level)
+        w, h = stamp.get_size()
+        # The mask is cut for the middle of the light's offset step
+        world = (tile[0] * ts + offset[0], tile[1] * ts + offset[1])
+        polygon = self.light_polygon(world, max(w, h) // 2)
+        # Polygon points relative to the stamp's top-left corner
+        ox, oy = world[0] - w // 2, world[1] - h // 2
+        mask = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.polygon(mask, (255, 255, 255, 255), [(x - ox, y - oy) for x, y in polygon])
+
+        mask.blit(stamp, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return self.masked.put(key, mask, w * h)
+
+    def add_glow(self, position, radius, color):
+        """Paint a solid coloured spot into the fog (e.g. an orb's core)."""
+        if not self.on_screen(position, radius, radius):
+            return
+        self.fog_queue.call(lambda fog: pygame.draw.circle(fog, color, position, radius))
+
+    def flush(self):
+        """Bring the fog surface up to date with the lights added this frame."""
+        self.fog_queue.flush(self.fog)
+
+    def draw(self, surface, queue=None):
+        self.flush()
+        if queue is not None:
+            queue.add(self.fog, (0, 0), layer=LAYER_LIGHTING)
+        else:
+            surface.blit(self.fog, (0, 0))
@@ -0,0 +1,25 @@
+"""Convert maps between the editor's sparse JSON and the binary .llmap format.
+
+    python -m scripts.mapconv map.json map.llmap
+    python -m scripts.mapconv map.llmap map.json
+
+The output format is picked from the output file's extension.
+"""
+import sys
+from scripts.Tilemap import TileMap
+
+
+def convert(src, dst):
+    tilemap = TileMap(src)
+    if dst.lower().endswith(".json"):
+        tilemap.save_json(dst)
+    else:
+        tilemap.save_binary(dst)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m scripts.mapconv <input> <output>")
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
+    print(f"Converted {sys.argv[1]} -> {sys.argv[2]}")
@@ -1,44 +1,95 @@
+from scripts.text_cache import render_wrapped, wrap_lines
+
+
+class Message:
+    __slots__ = ("text", "surface", "duration", "priority", "age", "order")
+
+    def __init__(self, text, surface, duration, priority, order):
+        self.text = text
+        self.surface = surface    # rendered once when queued
+        self.duration = duration  # seconds on screen, fades included
+        self.priority = priority
+        self.age = 0.0
+        self.order = order
+
+
 class MessageManager:
-    def __init__(self, font, fps=60, max_width=760):
-        self.messages = []  # current messages
-        self.timer = []     # frame timer for each message
+    """Timed on-screen messages.
+
+    Messages count down in seconds of game time. Only the `max_visible`
+    highest-priority messages are shown at once; the rest wait their turn.
+    Queuing text that is already pending refreshes it instead of stacking a copy.
+    """
+
+    def __init__(self, font, max_width=760, max_visible=3, fade_time=0.25):
         self.font = font
-        self.fps = fps
         self.max_width = max_width  # maximum width for messages
+        self.max_visible = max_visible
+        self.fade_time = fade_time
+        self.messages = []  # pending messages, in display order
+        self.by_text = {}   # text -> Message, for de-duplication
+        self.added = 0
+
+    def add_message(self, text, duration_seconds=2, priority=0):
+        """Show `text` for `duration_seconds`; higher `priority` displaces lower."""
+        msg = self.by_text.get(text)
+        if msg is not None:
+            # Already pending: keep it up for at least the new duration from now.
+            # The fade-in follows its age, so it is not replayed
+            msg.duration = max(msg.duration, msg.age + duration_seconds)
+            if priority > msg.priority:
+                msg.priority = priority
+                self.messages.sort(key=self._sort_key)
+            return msg
+
+        surface = None
+        if self.font:
+            # Own copy, so per-message fading does not touch the shared text cache
+            surface = render_wrapped(self.font, text, (255, 255, 200), self.max_width).copy()
+        msg = Message(text, surface, duration_seconds, priority, self.added)
+        self.added += 1
+        self.messages.append(msg)
+        self.messages.sort(key=self._sort_key)
+        self.by_text[text] = msg
+        return msg
+
+    @staticmethod
+    def _sort_key(msg):
+        return -msg.priority, msg.order
+
+    def update(self, dt):
+        """Age the visible messages by `dt` seconds and drop the expired ones."""
+        expired = False
+        for msg in self.messages[:self.max_visible]:
+            msg.age += dt
+            expired = expired or msg.age >= msg.duration
+        if expired:
+            for msg in self.messages[:self.max_visible]:
+                if msg.age >= msg.duration:
+                    del self.by_text[msg.text]
+            self.messages = [msg for msg in self.messages if msg.age < msg.duration]
+
+    def clear(self):
+        self.messages = []
+        self.by_text = {}
 
-    def add_message(self, text, duration_seconds=2): 
-        # Add a message that lasts `duration_seconds` seconds.
-        self.messages.append(text)
-        self.timer.append(int(duration_seconds * self.fps))
+    def visible(self):
+        return self.messages[:self.max_visible]
 
-    def update(self):
-        for i in reversed(range(len(self.timer))):
-            self.timer[i] -= 1
-            if self.timer[i] <= 0:
-                self.timer.pop(i)
-                self.messages.pop(i)
+    def alpha(self, msg):
+        """0-255 opacity of `msg`, ramping over fade_time at both ends."""
+        if self.fade_time <= 0:
+            return 255
+        fade = min(msg.age, msg.duration - msg.age, self.fade_time) / self.fade_time
+        return max(0, min(255, int(fade * 255)))
 
     def wrap_text(self, text):
         """Return a list of lines wrapped to fit screen max_width."""
-        words = text.split(' ')
-        lines = []
-        current_line = ''
-        for word in words:
-            test_line = current_line + (' ' if current_line else '') + word
-            if self.font.size(test_line)[0] <= self.max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
-        return lines
+        return list(wrap_lines(self.font, text, self.max_width))
 
     def draw(self, surface):
         y_offset = 20
-        for msg in self.messages:
-            wrapped_lines = self.wrap_text(msg)
-            for line in wrapped_lines:
-                surf_msg = self.font.render(line, True, (255, 255, 200))
-                surface.blit(surf_msg, (20, y_offset))
-                y_offset += surf_msg.get_height() + 4  # spacing between lines
+        for msg in self.visible():
+            msg.surface.set_alpha(self.alpha(msg))
+            surface.blit(msg.surface, (20, y_offset))
+            y_offset += msg.surface.get_height()
@@ -1,5 +1,22 @@
 import pygame
 import math
+from scripts.render_queue import LAYER_ENTITIES
+
+_sprites = {}  # (outer, inner, colours) -> pre-drawn orb
+
+
+def orb_sprite(outer, inner, color, inner_color):
+    """The orb's two circles drawn once onto a surface centred at (outer, outer)."""
+    key = (outer, inner, color, inner_color)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        size = 2 * max(outer, inner) + 2
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        centre = (size // 2 - 1, size // 2 - 1)
+        pygame.draw.circle(sprite, color, centre, outer)
+        pygame.draw.circle(sprite, inner_color, centre, inner)
+        _sprites[key] = sprite
+    return sprite
 
 class Orb:
     def __init__(self, x, y, width=24, height=24):
@@ -25,14 +42,17 @@ class Orb:
         self.color = (178, 212, 221)      # main orb
         self.inner_color = (150, 190, 200) # darker, pulsing
 
+    def get_rect(self, tile_size=32):
+        return pygame.Rect(
+            self.tile_x * tile_size,
+            self.tile_y * tile_size,
+            self.width,
+            self.height
+        )
+
     def check_collision(self, player_rect, tile_size=32):
         if not self.collected:
-            rect = pygame.Rect(
-                self.tile_x * tile_size,
-                self.tile_y * tile_size,
-                self.width,
-                self.height
-            )
+            rect = self.get_rect(tile_size)
             if rect.colliderect(player_rect):
                 self.collected = True
                 return True
@@ -49,14 +69,17 @@ class Orb:
             self.pulse_timer += dt * 3  # pulse speed
             self.inner_radius = self.inner_min + (self.inner_max - self.inner_min) * (0.5 + 0.5 * math.sin(self.pulse_timer))
 
-    def draw(self, surface, camera_x=0, camera_y=0, tile_size=32):
+    def draw(self, surface, camera_x=0, camera_y=0, tile_size=32, queue=None):
         if not self.collected:
             # Pixel position
             px = self.tile_x * tile_size - camera_x + tile_size//2 + self.offset_x
             py = self.tile_y * tile_size - camera_y + tile_size//2 + self.offset_y
 
-            # Main orb
-            pygame.draw.circle(surface, self.color, (int(px), int(py)), self.width//2)
-
-            # Inner pulsing circle
-            pygame.draw.circle(surface, self.inner_color, (int(px), int(py)), int(self.inner_radius))
+            # Main orb with its inner pulsing circle
+            sprite = orb_sprite(self.width//2, int(self.inner_radius), self.color, self.inner_color)
+            half = sprite.get_width() // 2 - 1
+            dest = (int(px) - half, int(py) - half)
+            if queue is not None:
+                queue.add(sprite, dest, layer=LAYER_ENTITIES)
+            else:
+                surface.blit(sprite, dest)
@@ -1,6 +1,10 @@
 import pygame, os
+from scripts.sprites import get_sheet, AnimationSet
+from scripts.render_queue import LAYER_PLAYER
 
 ANIMATION_SPEED = 0.2  # seconds per frame
+FRAME_SIZE = (96, 128)  # on-screen size of a frame
+DIRECTIONS = ["down", "left_down", "left_up", "up", "right_up", "right_down"]  # sheet row order
 
 # Map movement direction to nearest sprite sheet row
 DIR_TO_ROW = {
@@ -24,31 +28,14 @@ class Player(pygame.sprite.Sprite):
         self.sheet_cols = 8
         self.sheet_rows = 6
 
-        # Load sprite sheets
+        # Frames are sliced and scaled once per process and shared between players
         base_path = os.path.join(os.getcwd(), "assets", "entities", "Player", "The Male adventurer - Free")
+        frame_size = (self.frame_width, self.frame_height)
         self.sheets = {
-            "idle": pygame.image.load(os.path.join(base_path, "idle.png")).convert_alpha(),
-            "walk": pygame.image.load(os.path.join(base_path, "walk.png")).convert_alpha()
+            name: get_sheet(os.path.join(base_path, f"{name}.png"), frame_size, FRAME_SIZE)
+            for name in ("idle", "walk")
         }
-
-        # Slice sheets into animations
-        self.animations = {}
-        directions = ["down", "left_down", "left_up", "up", "right_up", "right_down"]
-        for anim_name, sheet in self.sheets.items():
-            for row in range(self.sheet_rows):
-                direction_name = directions[row]
-                frames = []
-                for col in range(self.sheet_cols):
-                    frame = sheet.subsurface(
-                        col * self.frame_width,
-                        row * self.frame_height,
-                        self.frame_width,
-                        self.frame_height
-                    )
-                    # Scale to fit tile size
-                    frame = pygame.transform.scale(frame, (96, 128))
-                    frames.append(frame)
-                self.animations[f"{anim_name}_{direction_name}"] = frames
+        self.animations = AnimationSet(self.sheets, DIRECTIONS)
 
         # Initial state
         self.current_animation = "idle_down"
@@ -69,18 +56,24 @@ class Player(pygame.sprite.Sprite):
             hitbox_height
         )
 
-        # Movement
+        # Movement; sub-pixel position is kept in floats so small fixed steps add up
         self.speed = 300
         self.dx = 0
         self.dy = 0
+        self.pos_x, self.pos_y = float(self.hitbox.x), float(self.hitbox.y)
+        self.prev_pos = (self.pos_x, self.pos_y)  # position before the last update, for interpolation
 
         # Last vertical input for horizontal movement
         self.last_vertical = 1  # default down
 
     def handle_input(self):
         keys = pygame.key.get_pressed()
-        self.dx = (keys[pygame.K_d] - keys[pygame.K_a])
-        self.dy = (keys[pygame.K_s] - keys[pygame.K_w])
+        self.set_movement(keys[pygame.K_d] - keys[pygame.K_a], keys[pygame.K_s] - keys[pygame.K_w])
+
+    def set_movement(self, dx, dy):
+        """Apply a movement input (from the keyboard or a script)."""
+        self.dx = dx
+        self.dy = dy
         self.is_moving = (self.dx != 0 or self.dy != 0)
 
         anim_prefix = "walk" if self.is_moving else "idle"
@@ -95,8 +88,7 @@ class Player(pygame.sprite.Sprite):
                 dy_norm = 1
 
             direction_row = DIR_TO_ROW.get((dx_norm, dy_norm), 0)
-            directions = ["down", "left_down", "left_up", "up", "right_up", "right_down"]
-            direction = directions[direction_row]
+            direction = DIRECTIONS[direction_row]
         else:
             direction = "down"
 
@@ -109,17 +101,26 @@ class Player(pygame.sprite.Sprite):
             self.dy *= inv
 
     def update(self, dt):
+        # Follow the hitbox if something moved it directly
+        if (round(self.pos_x), round(self.pos_y)) != self.hitbox.topleft:
+            self.pos_x, self.pos_y = float(self.hitbox.x), float(self.hitbox.y)
+        self.prev_pos = (self.pos_x, self.pos_y)
+
         # Predict movement and check collisions
+        new_x = self.pos_x + self.dx * self.speed * dt
         new_hitbox = self.hitbox.copy()
-        new_hitbox.x += self.dx * self.speed * dt
+        new_hitbox.x = round(new_x)
         if not self.tilemap.is_solid(new_hitbox):
+            self.pos_x = new_x
             self.hitbox.x = new_hitbox.x
         # else:
         #     print("[DEBUG] Collision on X-axis")
 
+        new_y = self.pos_y + self.dy * self.speed * dt
         new_hitbox = self.hitbox.copy()
-        new_hitbox.y += self.dy * self.speed * dt
+        new_hitbox.y = round(new_y)
         if not self.tilemap.is_solid(new_hitbox):
+            self.pos_y = new_y
             self.hitbox.y = new_hitbox.y
         # else:
         #     print("[DEBUG] Collision on Y-axis")
@@ -139,8 +140,19 @@ class Player(pygame.sprite.Sprite):
 
         self.image = frames[self.frame_index]
 
-    def draw(self, surf, camera_x=0, camera_y=0):
-        surf.blit(self.image, self.rect.move(-camera_x, -camera_y))
+    def render_offset(self, alpha=1.0):
+        """Offset from the current position to the one interpolated `alpha`
+        of the way from the previous update to the current one."""
+        prev_x, prev_y = self.prev_pos
+        return (round((prev_x - self.pos_x) * (1 - alpha)), round((prev_y - self.pos_y) * (1 - alpha)))
+
+    def draw(self, surf, camera_x=0, camera_y=0, alpha=1.0, queue=None):
+        ox, oy = self.render_offset(alpha)
+        dest = self.rect.move(ox - camera_x, oy - camera_y)
+        if queue is not None:
+            queue.add(self.image, dest, layer=LAYER_PLAYER)
+        else:
+            surf.blit(self.image, dest)
         #DEBUG: red rect at player sprite feet
         # pygame.draw.rect(surf, (255, 0, 0), self.hitbox.move(-camera_x, -camera_y), 1)
 
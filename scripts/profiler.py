@@ -0,0 +1,147 @@
+"""Frame-time instrumentation: named timing scopes, per-frame counters, an
+on-screen overlay and an optional per-frame CSV/JSON dump.
+
+When disabled, scope() hands back a shared no-op context manager and
+count()/end_frame() return immediately, so instrumented code costs a
+method call per scope.
+"""
+import time, json, csv
+from collections import deque
+from contextlib import nullcontext
+import pygame
+
+_NULL_SCOPE = nullcontext()
+DUMP_BATCH = 120  # frames buffered before they are appended to the dump file
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        frame = self.profiler.frame
+        frame[self.name] = frame.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=False, window=120, dump_path=None):
+        self.enabled = enabled or dump_path is not None
+        self.overlay = enabled
+        self.window = window
+        self.dump_path = dump_path
+        self.scopes = {}     # name -> reusable _Scope
+        self.frame = {}      # timings (ms) for the frame in progress
+        self.counts = {}     # counters for the frame in progress
+        self.history = {}    # name -> deque of recent per-frame ms
+        self.last_counts = {}
+        self.rows = []       # per-frame records not yet written to dump_path
+        self.fields = []     # CSV columns written so far
+        self.rows_written = 0
+        self.frame_start = time.perf_counter()
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.enabled = self.overlay or self.dump_path is not None
+        self.frame_start = time.perf_counter()
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = _Scope(self, name)
+        return scope
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame["frame"] = (now - self.frame_start) * 1000
+        self.frame_start = now
+
+        for name, ms in self.frame.items():
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+            self.history[name].append(ms)
+        if self.dump_path:
+            self.rows.append({**self.frame, **self.counts})
+            if len(self.rows) >= DUMP_BATCH:
+                self.write_rows()
+        self.last_counts = self.counts
+        self.frame = {}
+        self.counts = {}
+
+    def stats(self, name):
+        """(rolling average, p99) in ms for a scope."""
+        samples = sorted(self.history.get(name, ()))
+        if not samples:
+            return 0.0, 0.0
+        return sum(samples) / len(samples), samples[int(0.99 * (len(samples) - 1))]
+
+    def draw(self, surface, font, pos=(10, 40)):
+        if not self.overlay:
+            return
+        lines = [f"{'scope':<16}{'avg':>7}{'p99':>7}"]
+        for name in self.history:
+            avg, p99 = self.stats(name)
+            lines.append(f"{name:<16}{avg:>7.2f}{p99:>7.2f}")
+        for name, n in self.last_counts.items():
+            lines.append(f"{name:<16}{n:>7}")
+
+        line_h = font.get_linesize()
+        panel = pygame.Surface((240, line_h * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (200, 255, 200)), (6, 4 + i * line_h))
+        surface.blit(panel, pos)
+
+    def write_rows(self):
+        """Append the buffered frames to dump_path (.json, anything else is CSV),
+        so a long or killed session keeps what it recorded without holding it all."""
+        rows, self.rows = self.rows, []
+        if not self.dump_path or not rows:
+            return
+        first = self.rows_written == 0
+        self.rows_written += len(rows)
+        if self.dump_path.lower().endswith(".json"):
+            # One array, closed by dump() at exit
+            with open(self.dump_path, "w" if first else "a", encoding="utf-8") as f:
+                f.write(("[\n" if first else ",\n") + ",\n".join(json.dumps(row) for row in rows))
+            return
+        new_fields = []
+        for row in rows:
+            new_fields.extend(k for k in row if k not in self.fields and k not in new_fields)
+        if new_fields and not first:
+            # A scope or counter showed up late: rewrite what is there under the wider header
+            with open(self.dump_path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f)) + rows
+            first = True
+        self.fields.extend(new_fields)
+        with open(self.dump_path, "w" if first else "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fields)
+            if first:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def dump(self):
+        """Write out the frames still buffered; call once at exit."""
+        self.write_rows()
+        if self.rows_written and self.dump_path.lower().endswith(".json"):
+            with open(self.dump_path, "a", encoding="utf-8") as f:
+                f.write("\n]\n")
+
+
+# Shared disabled profiler for code that was not handed a real one
+NULL_PROFILER = Profiler()
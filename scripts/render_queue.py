@@ -0,0 +1,54 @@
+"""Batched draw submission.
+
+Subsystems push (surface, dest, area, flags) entries instead of blitting
+straight away; flush() sorts them by layer and hands each run to a single
+Surface.blits() call. Entries keep their own blend flags, and the order
+within a layer is the order they were pushed, so additive and subtractive
+blits land exactly as individual blits would. Drawing that is not a blit
+(pygame.draw shapes) goes in as a call() entry, which ends the current batch.
+"""
+
+# Layers, drawn lowest first
+LAYER_WORLD = 0     # tilemap
+LAYER_ENTITIES = 1  # orbs, shrines and their glows
+LAYER_LIGHTING = 2  # the fog of war
+LAYER_PLAYER = 3    # drawn over the fog
+LAYER_UI = 4
+
+
+class RenderQueue:
+    def __init__(self):
+        self.entries = []  # (layer, blit tuple or callable)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, surface, dest, area=None, flags=0, layer=LAYER_WORLD):
+        self.entries.append((layer, (surface, dest, area, flags)))
+
+    def extend(self, blits, layer=LAYER_WORLD):
+        """Queue (surface, dest, area, flags) tuples in one go."""
+        self.entries.extend((layer, blit) for blit in blits)
+
+    def call(self, fn, layer=LAYER_WORLD):
+        """Queue `fn(target)` for drawing that cannot be expressed as a blit."""
+        self.entries.append((layer, fn))
+
+    def clear(self):
+        self.entries.clear()
+
+    def flush(self, target):
+        """Draw everything onto `target` in layer order and empty the queue."""
+        self.entries.sort(key=lambda entry: entry[0])  # stable: push order kept within a layer
+        batch = []
+        for _, entry in self.entries:
+            if callable(entry):
+                if batch:
+                    target.blits(batch, doreturn=False)
+                    batch = []
+                entry(target)
+            else:
+                batch.append(entry)
+        if batch:
+            target.blits(batch, doreturn=False)
+        self.entries.clear()
@@ -1,5 +1,41 @@
 import pygame
 import sys
+from scripts.spatial import SpatialHash
+from scripts.render_queue import RenderQueue, LAYER_ENTITIES
+
+_surfaces = {}  # cached shrine bodies, glows and the fade overlay
+
+
+def _cached(key, build):
+    surf = _surfaces.get(key)
+    if surf is None:
+        surf = _surfaces[key] = build()
+    return surf
+
+
+def _solid(size, color):
+    def build():
+        surf = pygame.Surface(size)
+        surf.fill(color)
+        return surf
+    return _cached(("solid", size, color), build)
+
+
+def _glow_oval(w, h):
+    def build():
+        surf = pygame.Surface((w*2, h*2), pygame.SRCALPHA)
+        pygame.draw.ellipse(surf, (255, 255, 200, 120), (0, 0, w*2, h*2))
+        return surf
+    return _cached(("oval", w, h), build)
+
+
+def _glow_circle(radius):
+    def build():
+        surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (255, 255, 200, 120), (radius, radius), radius)
+        return surf
+    return _cached(("circle", radius), build)
+
 
 class Shrine:
     def __init__(self, x, y, max_light=5, name="Shrine", lore=""):
@@ -16,9 +52,12 @@ class Shrine:
         # For end sequence visual
         self.end_radius = 0
 
-    def draw(self, surface):
+    def draw(self, surface, queue=None):
         color = (255, 255, 100) if self.activated else self.color
-        pygame.draw.rect(surface, color, self.rect)
+        if queue is not None:
+            queue.add(_solid(self.rect.size, color), self.rect.topleft, layer=LAYER_ENTITIES)
+        else:
+            pygame.draw.rect(surface, color, self.rect)
 
     def add_light(self):
         if self.light < self.max_light:
@@ -35,6 +74,8 @@ class ShrineManager:
         self.main_shrine = None
         self.total_orbs = total_orbs
         self.main_shrine_player_inside = False
+        self.index = SpatialHash(tilemap.tile_size)  # all shrines, main included
+        self.occupied = []  # regular shrines the player is currently standing on
 
         # End sequence variables
         self.ending = False
@@ -53,39 +94,45 @@ class ShrineManager:
         }
 
         # Regular shrines
-        shrine_logic_layer = tilemap.layers.get("shrine_logic", [])
-        for y, row in enumerate(shrine_logic_layer):
-            for x, tile in enumerate(row):
-                if tile:
-                    world_x = x * tilemap.tile_size
-                    world_y = y * tilemap.tile_size
-                    lore_msg = custom_messages.get(
-                        (x, y),
-                        f"You step onto a Shrine at ({x},{y}) and feel a faint warmth..."
-                    )
-                    self.shrines.append(
-                        Shrine(world_x, world_y, max_light=5, name=f"Shrine {len(self.shrines)+1}", lore=lore_msg)
-                    )
+        for x, y, tile in tilemap.cells("shrine_logic"):
+            world_x = x * tilemap.tile_size
+            world_y = y * tilemap.tile_size
+            lore_msg = custom_messages.get(
+                (x, y),
+                f"You step onto a Shrine at ({x},{y}) and feel a faint warmth..."
+            )
+            self.shrines.append(
+                Shrine(world_x, world_y, max_light=5, name=f"Shrine {len(self.shrines)+1}", lore=lore_msg)
+            )
 
         # Main shrine
-        main_layer = tilemap.layers.get("main_shrine_marker", [])
-        for y, row in enumerate(main_layer):
-            for x, tile in enumerate(row):
-                if tile:
-                    world_x = x * tilemap.tile_size
-                    world_y = y * tilemap.tile_size
-                    self.main_shrine = Shrine(world_x, world_y, max_light=10, name="Main Shrine")
-                    self.main_shrine.player_inside = False
-
-    def update(self, player, message_manager, orbs_collected, dt):
-        # Regular shrine interactions
-        for shrine in self.shrines:
+        for x, y, tile in tilemap.cells("main_shrine_marker"):
+            world_x = x * tilemap.tile_size
+            world_y = y * tilemap.tile_size
+            self.main_shrine = Shrine(world_x, world_y, max_light=10, name="Main Shrine")
+            self.main_shrine.player_inside = False
+
+        for shrine in self.shrines + ([self.main_shrine] if self.main_shrine else []):
+            self.index.insert(shrine, shrine.rect)
+
+    def shrines_near(self, rect):
+        """Shrines (including the main one) whose cells overlap `rect`."""
+        return self.index.query_rect(rect)
+
+    def update(self, player, message_manager, orbs_collected, dt, view_size=None):
+        # Regular shrine interactions: nearby shrines plus any we may have just left
+        nearby = [s for s in self.shrines_near(player.hitbox) if s is not self.main_shrine]
+        occupied = []
+        for shrine in nearby + [s for s in self.occupied if s not in nearby]:
             colliding = player.hitbox.colliderect(shrine.rect)
             if colliding and not shrine.player_inside:
                 if shrine.add_light() or not shrine.message_shown:
                     message_manager.add_message(shrine.lore, duration_seconds=1.5)
                     shrine.message_shown = True
             shrine.player_inside = colliding
+            if colliding:
+                occupied.append(shrine)
+        self.occupied = occupied
 
         # Main shrine interaction
         if self.main_shrine:
@@ -104,7 +151,7 @@ class ShrineManager:
 
                 # Show message only once per shrine visit
                 if not self.main_shrine.message_shown:
-                    message_manager.add_message(text, duration_seconds=2)
+                    message_manager.add_message(text, duration_seconds=2, priority=1)
                     self.main_shrine.message_shown = True
 
             # Reset message_shown if player leaves shrine
@@ -119,8 +166,8 @@ class ShrineManager:
             self.main_shrine.end_radius += 300 * dt  # px per second
 
             # Fade to black when radius covers the screen diagonal
-            screen_diag = (pygame.display.get_surface().get_width() ** 2 +
-                        pygame.display.get_surface().get_height() ** 2) ** 0.5
+            view_w, view_h = view_size or pygame.display.get_surface().get_size()
+            screen_diag = (view_w ** 2 + view_h ** 2) ** 0.5
             if self.main_shrine.end_radius >= screen_diag / 2:
                 self.fade_alpha = min(255, self.fade_alpha + 150 * dt)
 
@@ -128,37 +175,44 @@ class ShrineManager:
             if self.fade_alpha >= 255:
                 self.show_closing_scene()
 
-    def draw(self, surface):
-        for shrine in self.shrines:
-            shrine.draw(surface)
-            # Draw oval light around regular shrines
+    def draw(self, surface, queue=None):
+        """Draw shrines and their glows, into `queue` if given (else straight away)."""
+        own_queue = queue is None
+        if own_queue:
+            queue = RenderQueue()
+
+        # Only shrines whose glow reaches the surface are drawn
+        for shrine in self.shrines_near(surface.get_rect().inflate(60, 100)):
+            if shrine is self.main_shrine:
+                continue
+            shrine.draw(surface, queue)
+            # Oval light around regular shrines
             oval_width, oval_height = 30, 50
-            light_surf = pygame.Surface((oval_width*2, oval_height*2), pygame.SRCALPHA)
-            pygame.draw.ellipse(light_surf, (255, 255, 200, 120), (0, 0, oval_width*2, oval_height*2))
             shrine_center = shrine.rect.center
-            surface.blit(light_surf, (shrine_center[0]-oval_width, shrine_center[1]-oval_height), special_flags=pygame.BLEND_RGBA_ADD)
+            queue.add(_glow_oval(oval_width, oval_height), (shrine_center[0]-oval_width, shrine_center[1]-oval_height),
+                      flags=pygame.BLEND_RGBA_ADD, layer=LAYER_ENTITIES)
 
         if self.main_shrine:
-            self.main_shrine.draw(surface)
+            self.main_shrine.draw(surface, queue)
             # Draw main shrine light as circle
             if self.ending and self.main_shrine.end_radius > 0:
-                pygame.draw.circle(surface, (255, 255, 200),
-                                self.main_shrine.rect.center,
-                                int(self.main_shrine.end_radius))
+                center, radius = self.main_shrine.rect.center, int(self.main_shrine.end_radius)
+                queue.call(lambda target: pygame.draw.circle(target, (255, 255, 200), center, radius), LAYER_ENTITIES)
             else:
                 # Regular main shrine glow before end sequence
                 radius = 50
-                light_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-                pygame.draw.circle(light_surf, (255, 255, 200, 120), (radius, radius), radius)
                 shrine_center = self.main_shrine.rect.center
-                surface.blit(light_surf, (shrine_center[0]-radius, shrine_center[1]-radius), special_flags=pygame.BLEND_RGBA_ADD)
+                queue.add(_glow_circle(radius), (shrine_center[0]-radius, shrine_center[1]-radius),
+                          flags=pygame.BLEND_RGBA_ADD, layer=LAYER_ENTITIES)
 
         # Fade overlay for end sequence
         if self.ending and self.fade_alpha > 0:
-            fade_surf = pygame.Surface(surface.get_size())
-            fade_surf.fill((0, 0, 0))
+            fade_surf = _cached(("fade", surface.get_size()), lambda: pygame.Surface(surface.get_size()))
             fade_surf.set_alpha(int(self.fade_alpha))
-            surface.blit(fade_surf, (0, 0))
+            queue.add(fade_surf, (0, 0), layer=LAYER_ENTITIES)
+
+        if own_queue:
+            queue.flush(surface)
 
     def show_closing_scene(self):
         closing_screen = pygame.display.get_surface()
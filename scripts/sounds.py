@@ -1,49 +1,131 @@
-import pygame
+import pygame, sys, time
+from scripts.assets import asset_manager
 
-pygame.mixer.init()
+AMBIENT_SOUND = "assets/sounds/825858__vrymaa__monastery-atmosphere-monk-chant-chimes.wav"
+BUTTON_SOUND = "assets/sounds/613405__josheb_policarpio__button-6.wav"
+ORB_SOUND = "assets/sounds/432287__ari_glitch__magic-circle-short-ringing-sfx.mp3"
 
-# --- Load Sounds ---
-ambient_sound = pygame.mixer.Sound("assets/sounds/825858__vrymaa__monastery-atmosphere-monk-chant-chimes.wav")
-button_sound = pygame.mixer.Sound("assets/sounds/613405__josheb_policarpio__button-6.wav")
-orb_sound = pygame.mixer.Sound("assets/sounds/432287__ari_glitch__magic-circle-short-ringing-sfx.mp3")
+# The ambience is long: stream it from disk rather than decoding it into memory
+asset_manager.stream(AMBIENT_SOUND)
 
-ambient_volume = 0.3
-sfx_volume = 0.2
-sound_muted = False
 
-ambient_channel = None  # Keep track of the channel playing ambient
+class SoundSystem:
+    """Ambience streamed through pygame.mixer.music; short effects decoded in
+    memory and played on per-category channel pools.
+
+    Each category gets a fixed number of voices. When they are all busy the
+    one that has played longest is cut off, so a burst of effects in one
+    category never starves another. Volumes live on named buses.
+    """
+
+    def __init__(self, pools=None, buses=None):
+        self.pools = pools or {"ui": 2, "sfx": 6}         # category -> voice limit
+        self.buses = buses or {"music": 0.3, "sfx": 0.2}  # bus -> volume 0..1
+        self.bus_of = {"ui": "sfx", "sfx": "sfx"}         # category -> bus
+        self.muted = False
+        self.channels = {}  # category -> [Channel]
+        self.started = {}   # channel -> when its current sound started
+        self.music_path = None
+
+    @property
+    def ready(self):
+        return pygame.mixer.get_init() is not None
+
+    def init(self):
+        """Open the audio device and carve its channels into the pools."""
+        if not self.ready:
+            pygame.mixer.init()
+        total = sum(self.pools.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)  # nothing else may grab a pooled channel
+        index = 0
+        for category, voices in self.pools.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(index, index + voices)]
+            index += voices
+        self.apply_volumes()
+        if self.music_path:
+            self.play_music(self.music_path)
+
+    def gain(self, bus):
+        return 0 if self.muted else self.buses[bus]
+
+    def volume(self, bus):
+        return self.buses[bus]
+
+    def set_volume(self, bus, volume):
+        self.buses[bus] = max(0, min(1, volume))
+        self.apply_volumes()
+
+    def change_volume(self, bus, delta):
+        self.set_volume(bus, self.buses[bus] + delta)
+
+    def toggle_mute(self):
+        self.muted = not self.muted
+        self.apply_volumes()
+
+    def apply_volumes(self):
+        if not self.ready:
+            return
+        pygame.mixer.music.set_volume(self.gain("music"))
+        for category, channels in self.channels.items():
+            for channel in channels:
+                channel.set_volume(self.gain(self.bus_of[category]))
+
+    def play_music(self, path, loops=-1):
+        """Stream `path` on the music bus; remembered until audio is up."""
+        self.music_path = path
+        if not self.ready:
+            return
+        try:
+            pygame.mixer.music.load(path)
+        except pygame.error as e:
+            print(f"[sounds] could not stream {path}: {e}", file=sys.stderr)
+            return
+        pygame.mixer.music.set_volume(self.gain("music"))
+        pygame.mixer.music.play(loops)
+
+    def play(self, path, category="sfx"):
+        """Play a short effect on one of the category's voices."""
+        if not self.ready or self.muted:
+            return None
+        sound = asset_manager.sound(path)
+        channel = self._voice(category)
+        channel.play(sound)
+        channel.set_volume(self.gain(self.bus_of[category]))
+        self.started[channel] = time.perf_counter()
+        return channel
+
+    def _voice(self, category):
+        channels = self.channels[category]
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        # Every voice is busy: steal the one that started first
+        return min(channels, key=lambda channel: self.started.get(channel, 0))
+
+
+sound_system = SoundSystem()
+
+
+def init_audio():
+    """Open the audio device; deferred until the window is up, since it can be slow."""
+    sound_system.init()
+    asset_manager.preload([BUTTON_SOUND, ORB_SOUND])
 
 def play_ambient():
-    global ambient_channel
-    ambient_channel = ambient_sound.play(-1)
-    ambient_channel.set_volume(0 if sound_muted else ambient_volume)
+    sound_system.play_music(AMBIENT_SOUND)
 
 def toggle_mute():
-    global sound_muted
-    sound_muted = not sound_muted
-    volume = 0 if sound_muted else 1
-    if ambient_channel:
-        ambient_channel.set_volume(ambient_volume * volume)
-    button_sound.set_volume(sfx_volume * volume)
-    orb_sound.set_volume(sfx_volume * volume)
+    sound_system.toggle_mute()
 
 def change_ambient_volume(delta):
-    global ambient_volume
-    ambient_volume = max(0, min(1, ambient_volume + delta))
-    if ambient_channel and not sound_muted:
-        ambient_channel.set_volume(ambient_volume)
+    sound_system.change_volume("music", delta)
 
 def change_sfx_volume(delta):
-    global sfx_volume
-    sfx_volume = max(0, min(1, sfx_volume + delta))
-    if not sound_muted:
-        button_sound.set_volume(sfx_volume)
-        orb_sound.set_volume(sfx_volume)
+    sound_system.change_volume("sfx", delta)
 
 def play_button_sound():
-    if not sound_muted:
-        button_sound.play()
+    sound_system.play(BUTTON_SOUND, "ui")
 
 def play_orb_sound():
-    if not sound_muted:
-        orb_sound.play()
+    sound_system.play(ORB_SOUND, "sfx")
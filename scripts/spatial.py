@@ -0,0 +1,71 @@
+import pygame
+
+
+class SpatialHash:
+    """Uniform grid of buckets keyed on tile coordinates.
+
+    Objects are stored with a world-space rect and can be found again by rect
+    or radius without scanning every object. Each bucket is a dict used as an
+    ordered set, so query results come back in a stable order.
+    """
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.buckets = {}  # (cx, cy) -> {obj: None}
+        self.bounds = {}   # obj -> (cx0, cy0, cx1, cy1) inclusive cell range
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def __contains__(self, obj):
+        return obj in self.bounds
+
+    def cell_range(self, rect):
+        cs = self.cell_size
+        return (
+            int(rect.left // cs), int(rect.top // cs),
+            int((rect.right - 1) // cs), int((rect.bottom - 1) // cs)
+        )
+
+    def insert(self, obj, rect):
+        if obj in self.bounds:
+            self.remove(obj)
+        cx0, cy0, cx1, cy1 = bounds = self.cell_range(rect)
+        self.bounds[obj] = bounds
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                self.buckets.setdefault((cx, cy), {})[obj] = None
+
+    def remove(self, obj):
+        bounds = self.bounds.pop(obj, None)
+        if bounds is None:
+            return
+        cx0, cy0, cx1, cy1 = bounds
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = self.buckets.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del self.buckets[(cx, cy)]
+
+    def move(self, obj, rect):
+        """Update an object's rect; buckets are only touched if its cells change."""
+        if self.bounds.get(obj) != self.cell_range(rect):
+            self.insert(obj, rect)
+
+    def query_rect(self, rect):
+        """Objects whose cells overlap `rect` (a broad phase; callers do exact tests)."""
+        cx0, cy0, cx1, cy1 = self.cell_range(rect)
+        found = {}
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = self.buckets.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return list(found)
+
+    def query_radius(self, center, radius):
+        """Objects whose cells overlap the square around a circle."""
+        x, y = center
+        return self.query_rect(pygame.Rect(x - radius, y - radius, radius * 2 + 1, radius * 2 + 1))
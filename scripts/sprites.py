@@ -0,0 +1,78 @@
+"""Process-wide cache of sliced, pre-scaled animation frames.
+
+Sprite sheets are laid out one animation direction per row. A row is sliced
+and scaled the first time an animation from it is asked for, then shared by
+every entity using the same sheet, so spawning another Player (or an NPC
+with the same sheets) and restarting from the menu cost no image work.
+"""
+import pygame
+from scripts.assets import asset_manager
+
+_sheets = {}  # (path, frame_size, scale_to) -> SpriteSheet
+
+
+class SpriteSheet:
+    def __init__(self, path, frame_size, scale_to=None):
+        self.path = path
+        self.frame_w, self.frame_h = frame_size
+        self.scale_to = scale_to or frame_size
+        self.image = None
+        self.rows = {}  # row -> list of frames
+
+    def load(self):
+        if self.image is None:
+            self.image = asset_manager.image(self.path)
+        return self.image
+
+    @property
+    def cols(self):
+        return self.load().get_width() // self.frame_w
+
+    def row(self, row):
+        """Frames of one row, sliced and scaled on first use."""
+        frames = self.rows.get(row)
+        if frames is None:
+            image = self.load()
+            cols = self.cols
+            strip = image.subsurface(0, row * self.frame_h, cols * self.frame_w, self.frame_h)
+            # Scale the whole row at once; the frames are views into it
+            w, h = self.scale_to
+            strip = pygame.transform.scale(strip, (cols * w, h))
+            frames = [strip.subsurface(col * w, 0, w, h) for col in range(cols)]
+            self.rows[row] = frames
+        return frames
+
+
+def get_sheet(path, frame_size, scale_to=None):
+    """The shared SpriteSheet for `path` sliced at `frame_size`, scaled to `scale_to`."""
+    key = (path, tuple(frame_size), tuple(scale_to) if scale_to else None)
+    sheet = _sheets.get(key)
+    if sheet is None:
+        sheet = _sheets[key] = SpriteSheet(path, frame_size, scale_to)
+    return sheet
+
+
+def clear_cache():
+    _sheets.clear()
+
+
+class AnimationSet:
+    """Looks up "<sheet>_<direction>" animations, e.g. "walk_left_up",
+    loading the matching sheet row on first access."""
+
+    def __init__(self, sheets, directions):
+        self.sheets = sheets  # name -> SpriteSheet
+        self.directions = {name: row for row, name in enumerate(directions)}
+
+    def __getitem__(self, name):
+        sheet_name, _, direction = name.partition("_")
+        if sheet_name not in self.sheets or direction not in self.directions:
+            raise KeyError(name)
+        return self.sheets[sheet_name].row(self.directions[direction])
+
+    def __contains__(self, name):
+        sheet_name, _, direction = name.partition("_")
+        return sheet_name in self.sheets and direction in self.directions
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
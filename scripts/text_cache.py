@@ -0,0 +1,51 @@
+import pygame
+from collections import OrderedDict
+from scripts.utils import wrap_text
+
+# Shared LRU of rendered text, keyed by (font, text, color, wrap width).
+# Static and rarely-changing strings are rendered once instead of every frame.
+CACHE_SIZE = 512
+
+_cache = OrderedDict()
+
+
+def _cached(key, build):
+    value = _cache.get(key)
+    if value is None:
+        value = build()
+        _cache[key] = value
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return value
+
+
+def render_text(font, text, color):
+    """Cached equivalent of font.render(text, True, color)."""
+    return _cached((font, text, tuple(color), None), lambda: font.render(text, True, color))
+
+
+def wrap_lines(font, text, max_width):
+    """Cached wrap_text: the lines `text` breaks into at `max_width`."""
+    return _cached((font, text, None, max_width), lambda: tuple(wrap_text(text, font, max_width)))
+
+
+def render_wrapped(font, text, color, max_width, line_spacing=4):
+    """Render `text` wrapped to `max_width` as one left-aligned surface."""
+    def build():
+        lines = [render_text(font, line, color) for line in wrap_lines(font, text, max_width)]
+        height = sum(line.get_height() + line_spacing for line in lines)
+        width = max((line.get_width() for line in lines), default=0)
+        surf = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        y = 0
+        for line in lines:
+            # Copy pixels as-is; an alpha blend onto the transparent surface would darken edges
+            surf.blit(line, (0, y), special_flags=pygame.BLEND_RGBA_MAX)
+            y += line.get_height() + line_spacing
+        return surf
+    return _cached((font, text, tuple(color), max_width, line_spacing), build)
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,84 @@
+"""One shared atlas for every tilesheet.
+
+Sheets are copied whole into a few large surfaces (pages), packed in shelves.
+Each tile gets a global index whose source is (page, rect), so tiles are
+drawn with blit(page, dest, rect) or batched with Surface.blits instead of
+one small surface per tile. The game and the editor share the same atlas.
+"""
+import os
+import pygame
+from scripts.assets import asset_manager
+
+PAGE_SIZE = 2048
+
+
+class TileAtlas:
+    def __init__(self, tile_size=32, page_size=PAGE_SIZE):
+        self.tile_size = tile_size
+        self.page_size = page_size
+        self.pages = []    # atlas surfaces
+        self.sources = []  # global index -> (page surface, Rect)
+        self.sheets = {}   # sheet path -> (first index, cols, rows)
+        self.shelf_x = self.shelf_y = self.shelf_h = 0
+
+    def _place(self, w, h):
+        """Find room for a w x h block; returns (page index, x, y)."""
+        if self.pages and self.shelf_x + w > self.pages[-1].get_width():
+            self.shelf_x, self.shelf_y, self.shelf_h = 0, self.shelf_y + self.shelf_h, 0
+        if not self.pages or self.shelf_y + h > self.pages[-1].get_height():
+            page = pygame.Surface((max(w, self.page_size), max(h, self.page_size)), pygame.SRCALPHA)
+            if pygame.display.get_surface():
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+            self.pages.append(page)
+            self.shelf_x = self.shelf_y = self.shelf_h = 0
+        x, y = self.shelf_x, self.shelf_y
+        self.shelf_x += w
+        self.shelf_h = max(self.shelf_h, h)
+        return len(self.pages) - 1, x, y
+
+    def add_sheet(self, path):
+        """Pack a sheet (once) and return (first index, cols, rows)."""
+        key = asset_manager.key(path)
+        if key in self.sheets:
+            return self.sheets[key]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Tilesheet {path} not found")
+        sheet = asset_manager.image(path)
+        ts = self.tile_size
+        cols, rows = sheet.get_width() // ts, sheet.get_height() // ts
+        first = len(self.sources)
+        if cols and rows:
+            page_idx, px, py = self._place(cols * ts, rows * ts)
+            page = self.pages[page_idx]
+            # Copy pixels as-is; an alpha blend onto the transparent page would darken edges
+            page.blit(sheet, (px, py), (0, 0, cols * ts, rows * ts), special_flags=pygame.BLEND_RGBA_MAX)
+            for row in range(rows):
+                for col in range(cols):
+                    self.sources.append((page, pygame.Rect(px + col * ts, py + row * ts, ts, ts)))
+        self.sheets[key] = (first, cols, rows)
+        return self.sheets[key]
+
+    def index(self, path, tile_id):
+        """Global index of a sheet's tile, or None if the id is out of range."""
+        first, cols, rows = self.add_sheet(path)
+        return first + tile_id if 0 <= tile_id < cols * rows else None
+
+    def source(self, index):
+        """(page, rect) to blit a tile from."""
+        return self.sources[index]
+
+    def subsurface(self, index):
+        """A tile as a surface view into its page (no pixel copy)."""
+        page, rect = self.sources[index]
+        return page.subsurface(rect)
+
+
+_atlases = {}  # tile size -> shared TileAtlas
+
+
+def get_atlas(tile_size=32):
+    atlas = _atlases.get(tile_size)
+    if atlas is None:
+        atlas = _atlases[tile_size] = TileAtlas(tile_size)
+    return atlas
@@ -1,4 +1,5 @@
 import pygame
+from scripts.text_cache import render_text
 
 class Button:
     def __init__(self, text, x, y, w, h, font=None):
@@ -10,7 +11,7 @@ class Button:
         mouse_pos = pygame.mouse.get_pos()
         hovered = self.rect.collidepoint(mouse_pos)
         color = (255, 255, 255) if hovered or selected else (180, 180, 180)
-        surf = self.font.render(self.text, True, color)
+        surf = render_text(self.font, self.text, color)
         screen.blit(surf, self.rect.topleft)
 
     def handle_event(self, event, selected=False):
@@ -2,10 +2,13 @@ import pygame, sys
 from scripts.sounds import *
 from scripts.ui.button import Button
 from scripts.utils import wrap_text
+from scripts.text_cache import render_text
+from scripts.assets import asset_manager
 
-def main_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT, start_game, show_opening_scene, show_how_to_play):
+def main_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT, start_game, show_opening_scene, show_how_to_play, on_frame=None):
     menu_font = pygame.font.SysFont(None, 48)
     title_font = pygame.font.SysFont(None, 72, bold=True)
+    status_font = pygame.font.SysFont(None, 24)
     options = ["Play", "How to Play", "Options", "Quit"]
     selected = 0
     option_rects = []
@@ -18,7 +21,7 @@ def main_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT, start_game, show_openi
         option_rects.clear()
 
         # Draw title
-        title_surf = title_font.render(spaced_title, True, (255, 255, 255))
+        title_surf = render_text(title_font, spaced_title, (255, 255, 255))
         title_x = (SCREEN_WIDTH - title_surf.get_width()) // 2
         title_y = 80
         screen.blit(title_surf, (title_x, title_y))
@@ -26,13 +29,22 @@ def main_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT, start_game, show_openi
         # Draw menu options and build rects for mouse interaction
         for i, option in enumerate(options):
             color = (255, 255, 255) if i == selected else (150, 150, 150)
-            surf = menu_font.render(option, True, color)
+            surf = render_text(menu_font, option, color)
             x = (SCREEN_WIDTH - surf.get_width()) // 2
             y = 250 + i * 70
             screen.blit(surf, (x, y))
             option_rects.append(pygame.Rect(x, y, surf.get_width(), surf.get_height()))
 
+        # Assets keep loading in the background while the menu is up
+        asset_manager.pump()
+        loaded, total = asset_manager.progress()
+        if loaded < total:
+            status = render_text(status_font, f"Loading {loaded * 100 // total}%", (150, 150, 150))
+            screen.blit(status, (SCREEN_WIDTH - status.get_width() - 10, SCREEN_HEIGHT - status.get_height() - 10))
+
         pygame.display.flip()
+        if on_frame:
+            on_frame()
 
         # Handle input
         for event in pygame.event.get():
@@ -99,14 +111,14 @@ def show_options_menu(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
         # Draw options with current volume
         for i, item in enumerate(option_items):
             if item == "Ambient Volume":
-                text = f"{item}: {int(sounds.ambient_volume*100)}% (LEFT/RIGHT to adjust)"
+                text = f"{item}: {int(sounds.sound_system.volume('music')*100)}% (LEFT/RIGHT to adjust)"
             elif item == "SFX Volume":
-                text = f"{item}: {int(sounds.sfx_volume*100)}% (LEFT/RIGHT to adjust)"
+                text = f"{item}: {int(sounds.sound_system.volume('sfx')*100)}% (LEFT/RIGHT to adjust)"
             else:
                 text = item
 
             color = (255, 255, 255) if i == selected else (150, 150, 150)
-            surf = options_font.render(text, True, color)
+            surf = render_text(options_font, text, color)
             x = (SCREEN_WIDTH - surf.get_width()) // 2
             screen.blit(surf, (x, y))
             option_rects.append(pygame.Rect(x, y, surf.get_width(), surf.get_height()))
@@ -177,7 +189,7 @@ def show_how_to_play(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
 
         # Draw instructions
         for line in instructions:
-            surf = instr_font.render(line, True, (255, 255, 255))
+            surf = render_text(instr_font, line, (255, 255, 255))
             x = (SCREEN_WIDTH - surf.get_width()) // 2
             screen.blit(surf, (x, y_offset))
             y_offset += 40
@@ -185,7 +197,7 @@ def show_how_to_play(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
         # Draw Back button
         back_color = (255, 255, 255) if selected == 0 else (150, 150, 150)
         back_text = "Back"
-        back_surf = back_font.render(back_text, True, back_color)
+        back_surf = render_text(back_font, back_text, back_color)
         back_rect = back_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80))
         screen.blit(back_surf, back_rect.topleft)
 
@@ -1,7 +1,8 @@
 import pygame, sys, time
-from scripts.utils import wrap_text
+from scripts.text_cache import render_text, wrap_lines
 from scripts.ui.button import Button
 from scripts.sounds import play_button_sound
+from scripts.assets import asset_manager
 
 def show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
     lines = [
@@ -34,7 +35,7 @@ def show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
     # Button setup
     button_font = pygame.font.SysFont(None, 24)
     button_text = "Continue →"
-    button_surf = button_font.render(button_text, True, (255, 255, 255))
+    button_surf = render_text(button_font, button_text, (255, 255, 255))
     button_rect = button_surf.get_rect(bottomright=(SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20))
 
     # Main loop for opening text
@@ -55,13 +56,14 @@ def show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
             screen.fill((0, 0, 0))
             y_offset = 60  # <-- slightly higher
             for text_line in displayed_lines:
-                wrapped = wrap_text(text_line, scene_font, SCREEN_WIDTH - 40)
+                wrapped = wrap_lines(scene_font, text_line, SCREEN_WIDTH - 40)
                 for wrapped_line in wrapped:
-                    surf = scene_font.render(wrapped_line, True, (255, 255, 255))
+                    surf = render_text(scene_font, wrapped_line, (255, 255, 255))
                     x = (SCREEN_WIDTH - surf.get_width()) // 2
                     screen.blit(surf, (x, y_offset))
                     y_offset += 30
 
+            asset_manager.pump()
             pygame.display.flip()
             clock.tick(60)
 
@@ -72,7 +74,7 @@ def show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
         mouse_pos = pygame.mouse.get_pos()
         hovered = button_rect.collidepoint(mouse_pos)
         color = (255, 255, 255) if hovered else (180, 180, 180)
-        button_surf = button_font.render(button_text, True, color)
+        button_surf = render_text(button_font, button_text, color)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -89,9 +91,9 @@ def show_opening_scene(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
         screen.fill((0, 0, 0))
         y_offset = 60
         for text_line in displayed_lines:
-            wrapped = wrap_text(text_line, scene_font, SCREEN_WIDTH - 40)
+            wrapped = wrap_lines(scene_font, text_line, SCREEN_WIDTH - 40)
             for wrapped_line in wrapped:
-                surf = scene_font.render(wrapped_line, True, (255, 255, 255))
+                surf = render_text(scene_font, wrapped_line, (255, 255, 255))
                 x = (SCREEN_WIDTH - surf.get_width()) // 2
                 screen.blit(surf, (x, y_offset))
                 y_offset += 30
@@ -118,14 +120,14 @@ def show_how_to_play(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
         screen.fill((0, 0, 0))
         y_offset = 100
         for line in instructions:
-            surf = instr_font.render(line, True, (255, 255, 255))
+            surf = render_text(instr_font, line, (255, 255, 255))
             screen.blit(surf, ((SCREEN_WIDTH - surf.get_width()) // 2, y_offset))
             y_offset += 40
 
         # Back button
         back_color = (255, 255, 255) if selected == 0 else (150, 150, 150)
         back_text = "Back"
-        back_surf = back_font.render(back_text, True, back_color)
+        back_surf = render_text(back_font, back_text, back_color)
         back_rect = back_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80))
         screen.blit(back_surf, back_rect.topleft)
         pygame.display.flip()
@@ -164,8 +166,8 @@ def show_thank_you_screen(screen, clock, SCREEN_WIDTH, SCREEN_HEIGHT):
                 sys.exit()
 
         screen.fill((0, 0, 0))
-        text_surf = thank_font.render("THANK YOU FOR PLAYING", True, (255, 255, 255))
-        sub_surf = sub_font.render("Press ESC to quit", True, (200, 200, 200))
+        text_surf = render_text(thank_font, "THANK YOU FOR PLAYING", (255, 255, 255))
+        sub_surf = render_text(sub_font, "Press ESC to quit", (200, 200, 200))
         screen.blit(text_surf, ((SCREEN_WIDTH - text_surf.get_width()) // 2, SCREEN_HEIGHT // 2 - 50))
         screen.blit(sub_surf, ((SCREEN_WIDTH - sub_surf.get_width()) // 2, SCREEN_HEIGHT // 2 + 20))
         pygame.display.flip()